@@ -1,9 +1,10 @@
 """Application configuration."""
-import json
+import copy
 import os
+from dataclasses import dataclass, field
 from pathlib import Path
-from pydantic_settings import BaseSettings
-from pydantic import Field
+
+import orjson
 
 
 def get_data_path() -> Path:
@@ -22,19 +23,65 @@ def get_options_path() -> Path:
     return data / "options.json"
 
 
-class Settings(BaseSettings):
-    """Application settings loaded from environment and add-on options."""
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    """Return (mtime_ns, size) for a file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+# (options.json stamp, parsed options), see load_options
+_options_cache: tuple[tuple[int, int], dict] | None = None
+
+
+def load_options() -> dict:
+    """Load options.json, reusing the parsed dict until the file changes.
+
+    The returned dict is shared between callers and must not be mutated.
+    """
+    global _options_cache
+    options_path = get_options_path()
+    stamp = _file_stamp(options_path)
+    if stamp is None:
+        return {}
+    if _options_cache and _options_cache[0] == stamp:
+        return _options_cache[1]
+
+    options = orjson.loads(options_path.read_bytes())
+    _options_cache = (stamp, options)
+    return options
+
+
+def _env(name: str, default: str = "") -> str:
+    """Read an environment variable by upper- or lower-case name."""
+    return os.environ.get(name.upper(), os.environ.get(name, default))
+
+
+def _env_bool(name: str) -> bool:
+    """Read a boolean environment variable (true/1/yes/on)."""
+    return _env(name).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_list(name: str, default: str = "") -> tuple[str, ...]:
+    """Read a comma-separated environment variable as a tuple of values."""
+    return tuple(v.strip() for v in _env(name, default).split(",") if v.strip())
+
 
-    log_level: str = Field(default="info")
-    ha_url: str = Field(default="http://supervisor/core")
-    supervisor_token: str = Field(default="")
-    hassio_token: str = Field(default="")
-    ingress_path: str = Field(default="")
-    standalone_mode: bool = Field(default=False)
+@dataclass(slots=True, frozen=True)
+class Settings:
+    """Application settings loaded from environment and add-on options."""
 
-    class Config:
-        env_prefix = ""
-        case_sensitive = False
+    log_level: str = field(default_factory=lambda: _env("log_level", "info"))
+    ha_url: str = field(default_factory=lambda: _env("ha_url", "http://supervisor/core"))
+    supervisor_token: str = field(default_factory=lambda: _env("supervisor_token"), repr=False)
+    hassio_token: str = field(default_factory=lambda: _env("hassio_token"), repr=False)
+    ingress_path: str = field(default_factory=lambda: _env("ingress_path"))
+    standalone_mode: bool = field(default_factory=lambda: _env_bool("standalone_mode"))
+    cors_origins: tuple[str, ...] = field(default_factory=lambda: _env_list(
+        "cors_origins", "http://localhost:5173,http://127.0.0.1:5173"
+    ))
 
     @property
     def data_path(self) -> Path:
@@ -56,11 +103,7 @@ class Settings(BaseSettings):
 
     def load_addon_options(self) -> dict:
         """Load add-on options from options.json."""
-        options_path = get_options_path()
-        if options_path.exists():
-            with open(options_path) as f:
-                return json.load(f)
-        return {}
+        return copy.deepcopy(load_options())
 
 
 class TentConfig:
@@ -77,29 +120,49 @@ class TentConfig:
         self.notifications = data.get("notifications", {})
         self.control_settings = data.get("control_settings", {})
         self.growth_stage = data.get("growth_stage", {})
-
-    def get_all_entities(self) -> list[str]:
+        self.all_entities: tuple[str, ...] = tuple(
+            entity_id
+            for value in (*self.sensors.values(), *self.actuators.values())
+            for entity_id in (value if isinstance(value, list) else (value,))
+            if entity_id
+        )
+        # Membership view of all_entities; configs are rebuilt, not edited, on change
+        self.entity_id_set: frozenset[str] = frozenset(self.all_entities)
+
+    def get_all_entities(self) -> tuple[str, ...]:
         """Get all configured entity IDs."""
-        entities = []
-        for entity_id in self.sensors.values():
-            if entity_id:
-                entities.append(entity_id)
-        for entity_id in self.actuators.values():
-            if entity_id:
-                entities.append(entity_id)
-        return entities
+        return self.all_entities
+
+
+# (config.json stamp, options.json stamp) -> parsed tents, see load_tents_config
+_tents_cache: tuple[tuple, list[TentConfig]] | None = None
 
 
 def load_tents_config() -> list[TentConfig]:
-    """Load tent configurations from config.json (tent builder) or fallback to options.json."""
+    """Load tent configurations from config.json (tent builder) or fallback to options.json.
+
+    The parsed result is cached until either file's mtime or size changes.
+    """
+    global _tents_cache
     data_path = get_data_path()
+    config_path = data_path / "config.json"
+    options_path = get_options_path()
+
+    stamp = (_file_stamp(config_path), _file_stamp(options_path))
+    if _tents_cache and _tents_cache[0] == stamp:
+        return list(_tents_cache[1])
 
+    tents = _parse_tents_config(config_path)
+    _tents_cache = (stamp, tents)
+    return list(tents)
+
+
+def _parse_tents_config(config_path: Path) -> list[TentConfig]:
+    """Parse tent configurations, preferring config.json over options.json."""
     # First try config.json (saved by tent builder UI)
-    config_path = data_path / "config.json"
     if config_path.exists():
         try:
-            with open(config_path) as f:
-                config = json.load(f)
+            config = orjson.loads(config_path.read_bytes())
             tents = config.get("tents", [])
             if tents:
                 return [TentConfig(t) for t in tents]
@@ -107,15 +170,11 @@ def load_tents_config() -> list[TentConfig]:
             pass
 
     # Fallback to options.json (HA add-on config)
-    options_path = get_options_path()
-    if options_path.exists():
-        try:
-            with open(options_path) as f:
-                options = json.load(f)
-            tents = options.get("tents", [])
-            return [TentConfig(t) for t in tents]
-        except Exception:
-            pass
+    try:
+        tents = load_options().get("tents", [])
+        return [TentConfig(t) for t in tents]
+    except Exception:
+        pass
 
     return []
 
@@ -128,8 +187,7 @@ def load_addon_config() -> dict:
     config_path = data_path / "config.json"
     if config_path.exists():
         try:
-            with open(config_path) as f:
-                return json.load(f)
+            return orjson.loads(config_path.read_bytes())
         except Exception:
             pass
 
@@ -137,8 +195,7 @@ def load_addon_config() -> dict:
     options_path = get_options_path()
     if options_path.exists():
         try:
-            with open(options_path) as f:
-                return json.load(f)
+            return orjson.loads(options_path.read_bytes())
         except Exception:
             pass
 
@@ -149,8 +206,7 @@ def save_addon_config(config: dict):
     """Save the addon configuration to config.json."""
     data_path = get_data_path()
     config_path = data_path / "config.json"
-    with open(config_path, "w") as f:
-        json.dump(config, f, indent=2)
+    config_path.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2))
 
 
 settings = Settings()
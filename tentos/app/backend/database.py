@@ -1,14 +1,22 @@
 """Database models and utilities."""
 import asyncio
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timezone, timedelta
 from typing import AsyncGenerator
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Index
+
+import orjson
+from sqlalchemy import Column, Integer, BigInteger, String, Float, DateTime, Boolean, Text, ForeignKey, Index, JSON, delete, event, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, relationship
 
 from config import settings
 
 
+def utc_now_ms() -> int:
+    """Current UTC time as integer epoch milliseconds."""
+    return time.time_ns() // 1_000_000
+
+
 class Base(DeclarativeBase):
     """SQLAlchemy declarative base."""
     pass
@@ -21,13 +29,14 @@ class Event(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     tent_id = Column(String(64), nullable=False, index=True)
     event_type = Column(String(32), nullable=False, index=True)
-    timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    timestamp = Column(BigInteger, default=utc_now_ms, index=True)  # UTC epoch milliseconds
     notes = Column(Text, nullable=True)
     user = Column(String(64), nullable=True)
-    data = Column(Text, nullable=True)  # JSON string for extra data
+    data = Column(JSON(none_as_null=True), nullable=True)  # Extra data, stored as JSON text
 
     __table_args__ = (
         Index("ix_events_tent_time", "tent_id", "timestamp"),
+        Index("ix_events_tent_type_time", "tent_id", "event_type", "timestamp"),
     )
 
 
@@ -83,7 +92,8 @@ class SensorHistory(Base):
     timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
 
     __table_args__ = (
-        Index("ix_sensor_history_tent_sensor_time", "tent_id", "sensor_type", "timestamp"),
+        # Includes value so history range reads are answered from the index alone
+        Index("ix_sensor_history_cover", "tent_id", "timestamp", "sensor_type", "value"),
     )
 
 
@@ -133,16 +143,66 @@ class TelemetrySettings(Base):
 engine = create_async_engine(
     f"sqlite+aiosqlite:///{settings.db_path}",
     echo=False,
-    future=True
+    future=True,
+    connect_args={"check_same_thread": False, "timeout": 30},
+    json_serializer=lambda value: orjson.dumps(value).decode(),
+    json_deserializer=orjson.loads
 )
 
+# WAL lets the history/event writers and API readers run concurrently, and
+# synchronous=NORMAL drops the per-commit fsync that WAL makes unnecessary
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Stored in PRAGMA user_version; data migrations in init_db below this
+# version have already run and are skipped on startup
+SCHEMA_VERSION = 1
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS to every new connection."""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+def _create_missing_indexes(conn):
+    """Create indexes added to models after their tables already existed.
+
+    create_all() skips existing tables entirely, including any new indexes.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
 async def init_db():
     """Initialize database tables."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
+        # Superseded by ix_sensor_history_cover
+        await conn.execute(text("DROP INDEX IF EXISTS ix_sensor_history_tent_sensor_time"))
+        version = (await conn.execute(text("PRAGMA user_version"))).scalar()
+        if version < 1:
+            # Event timestamps used to be stored as DATETIME text; convert
+            # them to epoch milliseconds
+            await conn.execute(text(
+                "UPDATE events SET timestamp = "
+                "CAST(ROUND((julianday(timestamp) - 2440587.5) * 86400000) AS INTEGER) "
+                "WHERE typeof(timestamp) = 'text'"
+            ))
+        if version < SCHEMA_VERSION:
+            await conn.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -152,3 +212,15 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             yield session
         finally:
             await session.close()
+
+
+async def prune_sensor_history(retention_days: int) -> int:
+    """Delete sensor history older than retention_days; returns rows removed."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            delete(SensorHistory).where(SensorHistory.timestamp < cutoff)
+        )
+        # Refresh planner statistics when SQLite thinks they are stale
+        await conn.execute(text("PRAGMA optimize"))
+    return result.rowcount
@@ -1,11 +1,11 @@
 """Home Assistant WebSocket and REST API client."""
 import asyncio
-import json
 import logging
 import random
 from datetime import datetime, timedelta
-from typing import Any, Callable
+from typing import Any, Callable, Container
 import aiohttp
+import orjson
 import websockets
 from websockets.exceptions import ConnectionClosed
 
@@ -13,6 +13,28 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Max HA events buffered between the socket reader and the dispatcher
+RX_QUEUE_SIZE = 1000
+
+# State fields kept in the state cache (drops HA's per-state "context")
+STATE_CACHE_KEYS = ("entity_id", "state", "attributes", "last_changed", "last_updated")
+
+# Encoded subscribe_events body for _send_encoded (the id is spliced in front)
+SUBSCRIBE_STATE_CHANGED = orjson.dumps({
+    "type": "subscribe_events",
+    "event_type": "state_changed",
+}).decode()[1:]
+
+# Shared REST pool; idle keep-alive sockets are reused across polls
+HTTP_POOL_SIZE = 32
+HTTP_KEEPALIVE_SECONDS = 60
+
+
+def _expire_response(future: asyncio.Future):
+    """Fail a pending command response that HA did not answer in time."""
+    if not future.done():
+        future.set_exception(asyncio.TimeoutError())
+
 
 class HAClient:
     """Client for communicating with Home Assistant."""
@@ -21,14 +43,46 @@ class HAClient:
         self.ws_url = settings.ha_url.replace("http", "ws") + "/api/websocket"
         self.rest_url = settings.ha_url + "/api"
         self.token = settings.ha_token
+        self._auth_message = orjson.dumps({"type": "auth", "access_token": self.token}).decode()
         self.ws: websockets.WebSocketClientProtocol | None = None
         self.message_id = 0
         self.connected = False
-        self.state_callbacks: list[Callable] = []
+        # (callback, entity_ids or None for every entity)
+        self.state_callbacks: list[tuple[Callable, Container[str] | None]] = []
         self._pending_responses: dict[int, asyncio.Future] = {}
         self._receive_task: asyncio.Task | None = None
+        self._dispatch_task: asyncio.Task | None = None
+        self._rx_queue: asyncio.Queue = asyncio.Queue(maxsize=RX_QUEUE_SIZE)
+        # Queued message "type" -> handler; anything else is ignored
+        self._message_handlers: dict[str, Callable] = {"event": self._on_event}
         self._dev_mode = settings.is_dev_mode
+        if self._dev_mode:
+            # Bind the mock RPCs once rather than branching on every call
+            self.get_state = self._mock_get_state
+            self.get_states_for = self._mock_get_states_for
+            self.call_service = self._mock_call_service
+            self.turn_on = self._mock_turn_on
+            self.turn_off = self._mock_turn_off
+            self.subscribe_state_changes = self._mock_subscribe_state_changes
+            self.get_states = self._mock_get_states
+            self.get_history = self._mock_get_history
+            self.get_automations = self._mock_get_automations
+            self.get_automation_config = self._mock_get_automation_config
+            self.create_automation = self._mock_create_automation
+            self.update_automation = self._mock_update_automation
+            self.delete_automation = self._mock_delete_automation
         self._mock_states: dict[str, dict] = {}
+        # Numeric mock sensors, drifted as floats and formatted into _mock_states
+        self._mock_values: dict[str, float] = {}
+        # entity_id -> latest state, kept current by the state_changed subscription
+        self._states: dict[str, dict] = {}
+        self._states_primed = False
+        # (service, entity_id) -> encoded call_service body minus the id
+        self._service_templates: dict[tuple[str, str], str] = {}
+        # Shared REST session (connection pool + keep-alive), see _http_session
+        self._http: aiohttp.ClientSession | None = None
+        # Loop the client connected on; used to create command futures
+        self._loop: asyncio.AbstractEventLoop | None = None
 
     async def connect(self):
         """Connect to Home Assistant WebSocket API."""
@@ -54,34 +108,211 @@ class HAClient:
             "switch.flower_tent_light": {"state": "on", "attributes": {}},
             "switch.flower_tent_exhaust": {"state": "off", "attributes": {}},
         }
+        self._mock_values = {
+            entity_id: float(state["state"])
+            for entity_id, state in self._mock_states.items()
+            if entity_id.startswith("sensor.")
+        }
 
     async def _mock_state_loop(self):
         """Simulate state changes in dev mode."""
+        # entity_id -> state last sent to callbacks; mock turn_on/turn_off
+        # only edit _mock_states and are picked up on the next tick
+        notified: dict[str, str] = {}
         while self.connected:
             await asyncio.sleep(5)  # Update every 5 seconds
             # Simulate small temperature/humidity changes
+            values = self._mock_values
             for entity_id, state in self._mock_states.items():
                 if "temperature" in entity_id:
-                    current = float(state["state"])
-                    state["state"] = str(round(current + random.uniform(-0.5, 0.5), 1))
+                    values[entity_id] += random.uniform(-0.5, 0.5)
+                    state["state"] = format(values[entity_id], ".1f")
                 elif "humidity" in entity_id:
-                    current = float(state["state"])
-                    new_val = current + random.uniform(-2, 2)
-                    state["state"] = str(round(max(30, min(90, new_val)), 0))
+                    values[entity_id] = max(30.0, min(90.0, values[entity_id] + random.uniform(-2, 2)))
+                    state["state"] = format(values[entity_id], ".0f")
+
+                if notified.get(entity_id) == state["state"]:
+                    continue
+                notified[entity_id] = state["state"]
 
                 # Trigger callbacks
-                for callback in self.state_callbacks:
-                    try:
-                        await callback({
-                            "entity_id": entity_id,
-                            "new_state": {"entity_id": entity_id, **state},
-                            "old_state": None
-                        })
-                    except Exception as e:
-                        logger.error(f"Mock callback error: {e}")
+                await self._run_state_callbacks({
+                    "entity_id": entity_id,
+                    "new_state": {"entity_id": entity_id, **state},
+                    "old_state": None
+                })
+
+    async def _mock_get_state(self, entity_id: str) -> dict | None:
+        """Dev mode get_state."""
+        state = self._mock_states.get(entity_id)
+        if state:
+            return {"entity_id": entity_id, **state}
+        return None
+
+    async def _mock_get_states_for(self, entity_ids) -> list[dict]:
+        """Dev mode get_states_for."""
+        return [
+            {"entity_id": eid, **self._mock_states[eid]}
+            for eid in entity_ids if eid in self._mock_states
+        ]
+
+    async def _mock_call_service(
+        self,
+        domain: str,
+        service: str,
+        service_data: dict | None = None,
+        target: dict | None = None
+    ) -> dict:
+        """Dev mode call_service."""
+        logger.info("Dev mode: call_service %s.%s -> %s", domain, service, target)
+        return {"success": True}
+
+    async def _mock_turn_on(self, entity_id: str, **kwargs):
+        """Dev mode turn_on."""
+        if entity_id in self._mock_states:
+            self._mock_states[entity_id]["state"] = "on"
+        logger.info("Dev mode: turn_on %s", entity_id)
+        return {"success": True}
+
+    async def _mock_turn_off(self, entity_id: str):
+        """Dev mode turn_off."""
+        if entity_id in self._mock_states:
+            self._mock_states[entity_id]["state"] = "off"
+        logger.info("Dev mode: turn_off %s", entity_id)
+        return {"success": True}
+
+    async def _mock_subscribe_state_changes(
+        self, callback: Callable, entity_ids: Container[str] | None = None
+    ):
+        """Dev mode subscribe_state_changes; _mock_state_loop drives the callbacks."""
+        self.state_callbacks.append((callback, entity_ids))
+        logger.info("Dev mode: registered state callback")
+
+    async def _mock_get_states(self, keys: tuple[str, ...] | None = None) -> list[dict]:
+        """Dev mode get_states."""
+        states = [
+            {"entity_id": eid, **data}
+            for eid, data in self._mock_states.items()
+        ]
+        if keys:
+            return [{k: state.get(k) for k in keys} for state in states]
+        return states
+
+    async def _mock_get_history(
+        self,
+        entity_ids: list[str],
+        start_time: str,
+        end_time: str | None = None,
+        minimal: bool = False
+    ) -> list:
+        """Dev mode get_history: 24 hours of generated data."""
+        result = []
+        now = datetime.now()
+
+        # 24 hours of data, one point every 5 minutes, in chronological order.
+        # Timestamps are shared by every entity, so format them once.
+        stamps = [now - timedelta(minutes=i * 5) for i in range(287, -1, -1)]
+        changed = [ts.isoformat() for ts in stamps]
+        daytime = [6 <= ts.hour <= 18 for ts in stamps]
+
+        for entity_id in entity_ids:
+            if "temperature" in entity_id:
+                # Simulate day/night cycle
+                states = [str(round((24 if day else 20) + random.uniform(-2, 2), 1)) for day in daytime]
+            elif "humidity" in entity_id:
+                states = [str(round((55 if day else 65) + random.uniform(-5, 5), 1)) for day in daytime]
+            else:
+                states = [random.choice(("on", "off")) for _ in stamps]
+
+            result.append([
+                {"entity_id": entity_id, "state": state, "last_changed": ts}
+                for state, ts in zip(states, changed)
+            ])
+
+        return result
+
+    async def _mock_get_automations(self) -> list[dict]:
+        """Dev mode get_automations."""
+        return [
+            {
+                "entity_id": "automation.veg_tent_lights_on",
+                "state": "on",
+                "attributes": {
+                    "friendly_name": "Veg Tent Lights On",
+                    "last_triggered": "2024-01-15T06:00:00",
+                    "mode": "single",
+                    "current": 0
+                }
+            },
+            {
+                "entity_id": "automation.veg_tent_lights_off",
+                "state": "on",
+                "attributes": {
+                    "friendly_name": "Veg Tent Lights Off",
+                    "last_triggered": "2024-01-15T00:00:00",
+                    "mode": "single",
+                    "current": 0
+                }
+            },
+            {
+                "entity_id": "automation.flower_tent_high_temp_alert",
+                "state": "on",
+                "attributes": {
+                    "friendly_name": "Flower Tent High Temp Alert",
+                    "last_triggered": None,
+                    "mode": "single",
+                    "current": 0
+                }
+            }
+        ]
+
+    async def _mock_get_automation_config(self, automation_id: str) -> dict | None:
+        """Dev mode get_automation_config."""
+        return {
+            "id": automation_id,
+            "alias": f"Mock Automation {automation_id}",
+            "description": "A mock automation for development",
+            "trigger": [{"platform": "state", "entity_id": "sensor.mock"}],
+            "condition": [],
+            "action": [{"service": "switch.turn_on", "target": {"entity_id": "switch.mock"}}]
+        }
+
+    async def _mock_create_automation(self, config: dict) -> dict:
+        """Dev mode create_automation."""
+        logger.info("Dev mode: create_automation %s", config.get('alias'))
+        return {"success": True}
+
+    async def _mock_update_automation(self, automation_id: str, config: dict) -> dict:
+        """Dev mode update_automation."""
+        logger.info("Dev mode: update_automation %s", automation_id)
+        return {"success": True}
+
+    async def _mock_delete_automation(self, automation_id: str) -> dict:
+        """Dev mode delete_automation."""
+        logger.info("Dev mode: delete_automation %s", automation_id)
+        return {"success": True}
+
+    async def _run_state_callbacks(self, event_data: dict):
+        """Run the state callbacks interested in one event concurrently."""
+        entity_id = event_data.get("entity_id")
+        calls = [
+            self._safe_state_callback(callback, event_data)
+            for callback, entity_ids in self.state_callbacks
+            if entity_ids is None or entity_id in entity_ids
+        ]
+        if calls:
+            await asyncio.gather(*calls)
+
+    async def _safe_state_callback(self, callback: Callable, event_data: dict):
+        """Run a state callback, logging instead of raising its errors."""
+        try:
+            await callback(event_data)
+        except Exception as e:
+            logger.error("State callback error: %s", e)
 
     async def _real_connect(self):
         """Connect to Home Assistant WebSocket API."""
+        self._loop = asyncio.get_running_loop()
         try:
             headers = {"Authorization": f"Bearer {self.token}"}
             self.ws = await websockets.connect(
@@ -93,135 +324,218 @@ class HAClient:
 
             # Handle auth required message
             auth_required = await self.ws.recv()
-            auth_msg = json.loads(auth_required)
+            auth_msg = orjson.loads(auth_required)
 
             if auth_msg.get("type") == "auth_required":
                 # Send auth
-                await self.ws.send(json.dumps({
-                    "type": "auth",
-                    "access_token": self.token
-                }))
+                await self.ws.send(self._auth_message)
 
                 auth_result = await self.ws.recv()
-                result = json.loads(auth_result)
+                result = orjson.loads(auth_result)
 
                 if result.get("type") == "auth_ok":
                     self.connected = True
                     logger.info("Authenticated with Home Assistant")
-                    # Start receive loop
-                    self._receive_task = asyncio.create_task(self._receive_loop())
+                    self._start_receiving()
                 else:
                     raise Exception(f"Auth failed: {result}")
             elif auth_msg.get("type") == "auth_ok":
                 self.connected = True
-                self._receive_task = asyncio.create_task(self._receive_loop())
+                self._start_receiving()
 
         except Exception as e:
-            logger.error(f"Failed to connect to HA: {e}")
+            logger.error("Failed to connect to HA: %s", e)
             self.connected = False
             raise
 
     async def disconnect(self):
         """Disconnect from Home Assistant."""
         self.connected = False
+        self._states_primed = False
         if self._receive_task:
             self._receive_task.cancel()
+        if self._dispatch_task:
+            self._dispatch_task.cancel()
+            self._dispatch_task = None
         if self.ws:
             await self.ws.close()
+        if self._http:
+            await self._http.close()
+            self._http = None
+
+    def _http_session(self) -> aiohttp.ClientSession:
+        """Return the shared REST session, creating it on first use."""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                headers={"Authorization": f"Bearer {self.token}"},
+                connector=aiohttp.TCPConnector(
+                    limit=HTTP_POOL_SIZE,
+                    keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+                ),
+            )
+        return self._http
+
+    def _start_receiving(self):
+        """Start the socket reader and the event dispatcher tasks."""
+        if self._dispatch_task:
+            self._dispatch_task.cancel()
+        self._rx_queue = asyncio.Queue(maxsize=RX_QUEUE_SIZE)
+        self._dispatch_task = asyncio.create_task(self._dispatch_loop())
+        self._receive_task = asyncio.create_task(self._receive_loop())
 
     async def _receive_loop(self):
-        """Background task to receive WebSocket messages."""
+        """Background task to receive WebSocket messages.
+
+        Only reads frames: command responses are resolved inline, events are
+        queued for _dispatch_loop. A slow state callback therefore never
+        stalls reading, including the responses to commands it awaits.
+        """
         try:
             while self.connected and self.ws:
                 message = await self.ws.recv()
-                data = json.loads(message)
-                await self._handle_message(data)
+                data = orjson.loads(message)
+
+                # Handle response to our request
+                msg_id = data.get("id")
+                future = self._pending_responses.get(msg_id) if msg_id else None
+                if future is not None:
+                    if not future.done():
+                        future.set_result(data)
+                    continue
+
+                try:
+                    self._rx_queue.put_nowait(data)
+                except asyncio.QueueFull:
+                    logger.warning("HA event queue full, dropping message")
         except ConnectionClosed:
             logger.warning("WebSocket connection closed")
             self.connected = False
+            self._states_primed = False
         except asyncio.CancelledError:
             pass
         except Exception as e:
-            logger.error(f"Receive loop error: {e}")
+            logger.error("Receive loop error: %s", e)
             self.connected = False
 
-    async def _handle_message(self, data: dict):
-        """Handle incoming WebSocket message."""
-        msg_type = data.get("type")
-        msg_id = data.get("id")
+    async def _dispatch_loop(self):
+        """Hand queued HA messages to _handle_message in arrival order."""
+        while True:
+            data = await self._rx_queue.get()
+            try:
+                await self._handle_message(data)
+            except Exception as e:
+                logger.error("Message dispatch error: %s", e)
 
-        # Handle response to our request
-        if msg_id and msg_id in self._pending_responses:
-            self._pending_responses[msg_id].set_result(data)
+    async def _handle_message(self, data: dict):
+        """Handle an incoming WebSocket message by dispatching on its type."""
+        handler = self._message_handlers.get(data.get("type"))
+        if handler is not None:
+            await handler(data)
+
+    async def _on_event(self, data: dict):
+        """Handle an event message (only state_changed is subscribed)."""
+        event = data.get("event")
+        if not event or event.get("event_type") != "state_changed":
             return
 
-        # Handle state changed events
-        if msg_type == "event" and data.get("event", {}).get("event_type") == "state_changed":
-            event_data = data["event"]["data"]
-            for callback in self.state_callbacks:
-                try:
-                    await callback(event_data)
-                except Exception as e:
-                    logger.error(f"State callback error: {e}")
+        event_data = event["data"]
+        entity_id = event_data.get("entity_id")
+        new_state = event_data.get("new_state")
+        if new_state:
+            self._states[entity_id] = {k: new_state.get(k) for k in STATE_CACHE_KEYS}
+        else:
+            self._states.pop(entity_id, None)
+
+        await self._run_state_callbacks(event_data)
 
     async def _send_command(self, command: dict, timeout: float = 10.0) -> dict:
         """Send command and wait for response."""
+        return await self._send_encoded(orjson.dumps(command).decode()[1:], timeout)
+
+    async def _send_encoded(self, body: str, timeout: float = 10.0) -> dict:
+        """Send a pre-encoded command and wait for the response.
+
+        body is the command's JSON object with its opening brace removed; the
+        message id is spliced in front so the rest can be encoded once and reused.
+        """
         if not self.ws or not self.connected:
             raise Exception("Not connected to Home Assistant")
 
         self.message_id += 1
-        command["id"] = self.message_id
-
-        future = asyncio.get_event_loop().create_future()
-        self._pending_responses[self.message_id] = future
+        msg_id = self.message_id
 
-        await self.ws.send(json.dumps(command))
+        loop = self._loop
+        future = loop.create_future()
+        self._pending_responses[msg_id] = future
+        expiry = None
 
         try:
-            result = await asyncio.wait_for(future, timeout=timeout)
-            return result
+            await self.ws.send(f'{{"id":{msg_id},{body}')
+            # Expire the response future directly rather than through
+            # wait_for, which wraps every command in a second waiter future
+            expiry = loop.call_later(timeout, _expire_response, future)
+            return await future
         finally:
-            self._pending_responses.pop(self.message_id, None)
-
-    async def subscribe_state_changes(self, callback: Callable):
-        """Subscribe to state change events."""
-        self.state_callbacks.append(callback)
-
-        if self._dev_mode:
-            logger.info("Dev mode: registered state callback")
-            return
+            if expiry:
+                expiry.cancel()
+            self._pending_responses.pop(msg_id, None)
+
+    def _service_template(self, service: str, entity_id: str) -> str:
+        """Encoded call_service body targeting one entity, cached per entity."""
+        key = (service, entity_id)
+        body = self._service_templates.get(key)
+        if body is None:
+            body = orjson.dumps({
+                "type": "call_service",
+                "domain": entity_id.partition(".")[0],
+                "service": service,
+                "target": {"entity_id": entity_id},
+            }).decode()[1:]
+            self._service_templates[key] = body
+        return body
+
+    async def subscribe_state_changes(self, callback: Callable, entity_ids: Container[str] | None = None):
+        """Subscribe to state change events.
+
+        With entity_ids, the callback only runs for those entities. The
+        container is checked on every event, so a live mapping can be passed
+        and edited later.
+        """
+        self.state_callbacks.append((callback, entity_ids))
 
         # Send subscription request
-        result = await self._send_command({
-            "type": "subscribe_events",
-            "event_type": "state_changed"
-        })
+        result = await self._send_encoded(SUBSCRIBE_STATE_CHANGED)
 
         if not result.get("success"):
             raise Exception(f"Failed to subscribe: {result}")
 
         logger.info("Subscribed to state changes")
 
-    async def get_states(self) -> list[dict]:
-        """Get all current states."""
-        if self._dev_mode:
-            return [
-                {"entity_id": eid, **data}
-                for eid, data in self._mock_states.items()
-            ]
+        # Prime the state cache once; state_changed events keep it current
+        if not self._states_primed:
+            states = await self.get_states(keys=STATE_CACHE_KEYS)
+            self._states = {state["entity_id"]: state for state in states if state.get("entity_id")}
+            self._states_primed = True
 
+    async def get_states(self, keys: tuple[str, ...] | None = None) -> list[dict]:
+        """Get all current states.
+
+        With keys, each state is projected to just those fields so callers
+        that keep the result don't hold on to every nested dict HA sends.
+        """
         result = await self._send_command({"type": "get_states"})
-        if result.get("success"):
-            return result.get("result", [])
-        return []
+        if not result.get("success"):
+            return []
+        states = result.get("result", [])
+
+        if keys:
+            return [{k: state.get(k) for k in keys} for state in states]
+        return states
 
     async def get_state(self, entity_id: str) -> dict | None:
         """Get state for a specific entity."""
-        if self._dev_mode:
-            state = self._mock_states.get(entity_id)
-            if state:
-                return {"entity_id": entity_id, **state}
-            return None
+        if self._states_primed:
+            return self._states.get(entity_id)
 
         states = await self.get_states()
         for state in states:
@@ -229,6 +543,19 @@ class HAClient:
                 return state
         return None
 
+    async def get_states_for(self, entity_ids) -> list[dict]:
+        """Get current states for the given entities, skipping unknown ones.
+
+        Served from the state cache once it is primed, so only a cold
+        client pays for a full get_states round trip.
+        """
+        if self._states_primed:
+            states = self._states
+        else:
+            states = {state.get("entity_id"): state for state in await self.get_states()}
+
+        return [states[eid] for eid in entity_ids if eid in states]
+
     async def call_service(
         self,
         domain: str,
@@ -237,10 +564,6 @@ class HAClient:
         target: dict | None = None
     ) -> dict:
         """Call a Home Assistant service."""
-        if self._dev_mode:
-            logger.info(f"Dev mode: call_service {domain}.{service} -> {target}")
-            return {"success": True}
-
         command = {
             "type": "call_service",
             "domain": domain,
@@ -257,34 +580,18 @@ class HAClient:
 
     async def turn_on(self, entity_id: str, **kwargs):
         """Turn on an entity."""
-        if self._dev_mode:
-            if entity_id in self._mock_states:
-                self._mock_states[entity_id]["state"] = "on"
-            logger.info(f"Dev mode: turn_on {entity_id}")
-            return {"success": True}
-
-        domain = entity_id.split(".")[0]
+        if not kwargs:
+            return await self._send_encoded(self._service_template("turn_on", entity_id))
         return await self.call_service(
-            domain,
+            entity_id.partition(".")[0],
             "turn_on",
-            service_data=kwargs if kwargs else None,
+            service_data=kwargs,
             target={"entity_id": entity_id}
         )
 
     async def turn_off(self, entity_id: str):
         """Turn off an entity."""
-        if self._dev_mode:
-            if entity_id in self._mock_states:
-                self._mock_states[entity_id]["state"] = "off"
-            logger.info(f"Dev mode: turn_off {entity_id}")
-            return {"success": True}
-
-        domain = entity_id.split(".")[0]
-        return await self.call_service(
-            domain,
-            "turn_off",
-            target={"entity_id": entity_id}
-        )
+        return await self._send_encoded(self._service_template("turn_off", entity_id))
 
     async def set_fan_speed(self, entity_id: str, percentage: int):
         """Set fan speed percentage."""
@@ -300,204 +607,99 @@ class HAClient:
         self,
         entity_ids: list[str],
         start_time: str,
-        end_time: str | None = None
+        end_time: str | None = None,
+        minimal: bool = False
     ) -> list:
-        """Get history from HA REST API."""
-        if self._dev_mode:
-            return self._generate_mock_history(entity_ids, start_time, end_time)
+        """Get history from HA REST API.
 
-        headers = {"Authorization": f"Bearer {self.token}"}
+        With minimal, HA drops attributes and sends only state and
+        last_changed for every entry after the first of each entity, which
+        shrinks long sensor histories several times over.
+        """
         params = {"filter_entity_id": ",".join(entity_ids)}
 
         if end_time:
             params["end_time"] = end_time
+        if minimal:
+            # HA only checks these flags for presence
+            params["minimal_response"] = ""
+            params["no_attributes"] = ""
 
         url = f"{self.rest_url}/history/period/{start_time}"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, params=params) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-                else:
-                    logger.error(f"History API error: {resp.status}")
-                    return []
+        session = self._http_session()
+        async with session.get(url, params=params) as resp:
+            if resp.status == 200:
+                return orjson.loads(await resp.read())
+            else:
+                logger.error("History API error: %s", resp.status)
+                return []
 
     async def get_automations(self) -> list[dict]:
         """Get all HA automations via REST API."""
-        if self._dev_mode:
-            return self._generate_mock_automations()
-
-        headers = {"Authorization": f"Bearer {self.token}"}
         url = f"{self.rest_url}/states"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status == 200:
-                    states = await resp.json()
-                    # Filter to automation entities only
-                    return [s for s in states if s.get("entity_id", "").startswith("automation.")]
-                else:
-                    logger.error(f"States API error: {resp.status}")
-                    return []
+        session = self._http_session()
+        async with session.get(url) as resp:
+            if resp.status == 200:
+                states = await resp.json()
+                # Filter to automation entities only
+                return [s for s in states if s.get("entity_id", "").startswith("automation.")]
+            else:
+                logger.error("States API error: %s", resp.status)
+                return []
 
     async def get_automation_config(self, automation_id: str) -> dict | None:
         """Get the configuration/triggers for a specific automation."""
-        if self._dev_mode:
-            return self._get_mock_automation_config(automation_id)
-
-        headers = {"Authorization": f"Bearer {self.token}"}
         url = f"{self.rest_url}/config/automation/config/{automation_id}"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-                return None
-
-    def _get_mock_automation_config(self, automation_id: str) -> dict | None:
-        """Return mock automation config for dev mode."""
-        return {
-            "id": automation_id,
-            "alias": f"Mock Automation {automation_id}",
-            "description": "A mock automation for development",
-            "trigger": [{"platform": "state", "entity_id": "sensor.mock"}],
-            "condition": [],
-            "action": [{"service": "switch.turn_on", "target": {"entity_id": "switch.mock"}}]
-        }
+        session = self._http_session()
+        async with session.get(url) as resp:
+            if resp.status == 200:
+                return await resp.json()
+            return None
 
     async def create_automation(self, config: dict) -> dict:
         """Create a new automation via HA config API."""
-        if self._dev_mode:
-            logger.info(f"Dev mode: create_automation {config.get('alias')}")
-            return {"success": True}
-
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
         url = f"{self.rest_url}/config/automation/config/{config['id']}"
-        logger.info(f"Creating automation: POST {url}")
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=config) as resp:
-                if resp.status in (200, 201):
-                    # Reload automations (non-fatal if this fails)
-                    try:
-                        await self.call_service("automation", "reload")
-                    except Exception as e:
-                        logger.warning(f"Automation created but reload failed: {e}")
-                    return {"success": True}
-                else:
-                    error = await resp.text()
-                    logger.error(f"HA API returned {resp.status}: {error}")
-                    raise Exception(f"HA returned {resp.status}: {error}")
+        logger.info("Creating automation: POST %s", url)
+
+        session = self._http_session()
+        async with session.post(url, json=config) as resp:
+            if resp.status in (200, 201):
+                # Reload automations (non-fatal if this fails)
+                try:
+                    await self.call_service("automation", "reload")
+                except Exception as e:
+                    logger.warning("Automation created but reload failed: %s", e)
+                return {"success": True}
+            else:
+                error = await resp.text()
+                logger.error("HA API returned %s: %s", resp.status, error)
+                raise Exception(f"HA returned {resp.status}: {error}")
 
     async def update_automation(self, automation_id: str, config: dict) -> dict:
         """Update an existing automation via HA config API."""
-        if self._dev_mode:
-            logger.info(f"Dev mode: update_automation {automation_id}")
-            return {"success": True}
-
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
         url = f"{self.rest_url}/config/automation/config/{automation_id}"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url, headers=headers, json=config) as resp:
-                if resp.status == 200:
-                    await self.call_service("automation", "reload")
-                    return {"success": True}
-                else:
-                    error = await resp.text()
-                    raise Exception(f"Failed to update automation: {error}")
+        session = self._http_session()
+        async with session.put(url, json=config) as resp:
+            if resp.status == 200:
+                await self.call_service("automation", "reload")
+                return {"success": True}
+            else:
+                error = await resp.text()
+                raise Exception(f"Failed to update automation: {error}")
 
     async def delete_automation(self, automation_id: str) -> dict:
         """Delete an automation via HA config API."""
-        if self._dev_mode:
-            logger.info(f"Dev mode: delete_automation {automation_id}")
-            return {"success": True}
-
-        headers = {"Authorization": f"Bearer {self.token}"}
         url = f"{self.rest_url}/config/automation/config/{automation_id}"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.delete(url, headers=headers) as resp:
-                if resp.status in (200, 204):
-                    await self.call_service("automation", "reload")
-                    return {"success": True}
-                else:
-                    error = await resp.text()
-                    raise Exception(f"Failed to delete automation: {error}")
-
-    def _generate_mock_automations(self) -> list[dict]:
-        """Generate mock automations for dev mode."""
-        return [
-            {
-                "entity_id": "automation.veg_tent_lights_on",
-                "state": "on",
-                "attributes": {
-                    "friendly_name": "Veg Tent Lights On",
-                    "last_triggered": "2024-01-15T06:00:00",
-                    "mode": "single",
-                    "current": 0
-                }
-            },
-            {
-                "entity_id": "automation.veg_tent_lights_off",
-                "state": "on",
-                "attributes": {
-                    "friendly_name": "Veg Tent Lights Off",
-                    "last_triggered": "2024-01-15T00:00:00",
-                    "mode": "single",
-                    "current": 0
-                }
-            },
-            {
-                "entity_id": "automation.flower_tent_high_temp_alert",
-                "state": "on",
-                "attributes": {
-                    "friendly_name": "Flower Tent High Temp Alert",
-                    "last_triggered": None,
-                    "mode": "single",
-                    "current": 0
-                }
-            }
-        ]
-
-    def _generate_mock_history(self, entity_ids: list[str], start_time: str, end_time: str | None) -> list:
-        """Generate mock history data for dev mode."""
-        from datetime import datetime, timedelta
-        import random
-
-        result = []
-        now = datetime.now()
-
-        for entity_id in entity_ids:
-            history = []
-            # Generate 24 hours of data, one point every 5 minutes
-            for i in range(288):
-                ts = now - timedelta(minutes=i * 5)
-
-                if "temperature" in entity_id:
-                    # Simulate day/night cycle
-                    hour = ts.hour
-                    base = 24 if 6 <= hour <= 18 else 20
-                    value = base + random.uniform(-2, 2)
-                elif "humidity" in entity_id:
-                    hour = ts.hour
-                    base = 55 if 6 <= hour <= 18 else 65
-                    value = base + random.uniform(-5, 5)
-                else:
-                    value = random.choice(["on", "off"])
-
-                history.append({
-                    "entity_id": entity_id,
-                    "state": str(round(value, 1)) if isinstance(value, float) else value,
-                    "last_changed": ts.isoformat()
-                })
-
-            result.append(history[::-1])  # Reverse to chronological order
-
-        return result
+        session = self._http_session()
+        async with session.delete(url) as resp:
+            if resp.status in (200, 204):
+                await self.call_service("automation", "reload")
+                return {"success": True}
+            else:
+                error = await resp.text()
+                raise Exception(f"Failed to delete automation: {error}")
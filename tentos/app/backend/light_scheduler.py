@@ -10,6 +10,7 @@ level with no heavy imports so tests can import them directly.
 import asyncio
 import logging
 from datetime import datetime, timezone
+from typing import Callable, NamedTuple
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +26,13 @@ PHOTOPERIOD_PRESETS = {
     "flower": 12.0,
 }
 
-CHECK_INTERVAL_SECONDS = 60
+# The loop sleeps until the next on/off boundary, but never longer than this,
+# so lights switched outside TentOS are still brought back in line
+RESYNC_INTERVAL_SECONDS = 600
+
+# After a tick that skipped an unknown light state or failed to switch one,
+# check again this soon instead of waiting for the next boundary
+RETRY_INTERVAL_SECONDS = 60
 
 
 def parse_hhmm(value: str) -> int:
@@ -200,29 +207,79 @@ def validate_light_cycle(mode: str, hours: float) -> None:
         )
 
 
-def desired_light_state(now_minutes: int, on_time: str, hours: float) -> bool:
-    """Whether the light should be ON at now_minutes (minutes since local midnight)."""
+def light_cycle_boundaries(on_time: str, hours: float) -> tuple[int, ...]:
+    """Minutes of day at which the light switches (on, off); empty for always on/off."""
     hours = float(hours)
-    if hours >= 24:
-        return True
-    if hours <= 0:
-        return False
+    if hours >= 24 or hours <= 0:
+        return ()
     on_minutes = parse_hhmm(on_time)
-    off_minutes = (on_minutes + round(hours * 60)) % (24 * 60)
+    return (on_minutes, (on_minutes + round(hours * 60)) % (24 * 60))
+
+
+def compile_light_cycle(on_time: str, hours: float) -> Callable[[int], bool]:
+    """Build a predicate for whether the light should be ON at a minute of day.
+
+    The on/off boundaries are resolved to integer minutes once, so evaluating
+    the returned function is just int comparisons. Raises ValueError on bad input.
+    """
+    boundaries = light_cycle_boundaries(on_time, hours)
+    if not boundaries:
+        always_on = float(hours) >= 24
+        return lambda now_minutes: always_on
+    on_minutes, off_minutes = boundaries
     if on_minutes < off_minutes:
-        return on_minutes <= now_minutes < off_minutes
+        return lambda now_minutes: on_minutes <= now_minutes < off_minutes
     # Wraps past midnight (e.g. on 18:00 for 18h -> off 12:00)
-    return now_minutes >= on_minutes or now_minutes < off_minutes
+    return lambda now_minutes: now_minutes >= on_minutes or now_minutes < off_minutes
+
+
+def desired_light_state(now_minutes: int, on_time: str, hours: float) -> bool:
+    """Whether the light should be ON at now_minutes (minutes since local midnight)."""
+    return compile_light_cycle(on_time, hours)(now_minutes)
+
+
+def seconds_until_next_boundary(now: datetime, boundaries) -> float | None:
+    """Seconds from now until the next boundary minute, or None if there are none.
+
+    A boundary at the current instant counts as tomorrow's, so the caller
+    never spins on the transition it just handled.
+    """
+    now_seconds = now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+    delays = [((minutes * 60 - now_seconds) % 86400) or 86400 for minutes in boundaries]
+    return min(delays) if delays else None
+
+
+class CompiledLightCycle(NamedTuple):
+    """A tent's enabled light cycle with its on/off predicate prebuilt."""
+    mode: str
+    on_time: str
+    hours: float
+    is_on: Callable[[int], bool]
+    boundaries: tuple[int, ...]
 
 
 class LightScheduler:
-    """Background loop that keeps tent lights in sync with their light cycle."""
+    """Background loop that keeps tent lights in sync with their light cycle.
+
+    Instead of polling every minute, the loop sleeps until the next on/off
+    boundary of any tent (capped at RESYNC_INTERVAL_SECONDS) or until wake().
+    A tick that left a light unresolved caps the wait at RETRY_INTERVAL_SECONDS,
+    and an active override caps it at that override's expiry. Light state
+    changes, config reloads and override edits wake the loop as well.
+    """
 
     def __init__(self, ha_client, state_manager):
         self.ha_client = ha_client
         self.state_manager = state_manager
         self._running = False
         self._task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+        # Set by tick() when a light state was unknown or a switch failed
+        self._needs_retry = False
+        # tent_id -> earliest expiry (UTC) of an override tick() left alone
+        self._override_expiry: dict[str, datetime] = {}
+        # tent_id -> (TentConfig it was compiled from, compiled cycle or None if disabled)
+        self._cycles: dict[str, tuple[object, CompiledLightCycle | None]] = {}
 
     async def start(self):
         """Start the scheduler loop."""
@@ -239,15 +296,46 @@ class LightScheduler:
             self._task.cancel()
             self._task = None
 
+    def wake(self):
+        """Re-run the loop now and reschedule (call after light cycle changes)."""
+        self._wake.set()
+
     async def _loop(self):
         while self._running:
+            self._wake.clear()
             try:
                 await self.tick()
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Light scheduler tick error: {e}")
-            await asyncio.sleep(CHECK_INTERVAL_SECONDS)
+            try:
+                await asyncio.wait_for(self._wake.wait(), self._next_delay())
+            except asyncio.TimeoutError:
+                pass
+
+    def _next_delay(self) -> float:
+        """Seconds to sleep until the next light switch across all tents."""
+        boundaries = set()
+        for tent_id, tent in list(self.state_manager.tents.items()):
+            try:
+                cycle = self._compiled_cycle(tent_id, tent.config)
+            except (TypeError, ValueError):
+                continue
+            if cycle is not None:
+                boundaries.update(cycle.boundaries)
+        cap = RETRY_INTERVAL_SECONDS if self._needs_retry else RESYNC_INTERVAL_SECONDS
+        if self._override_expiry:
+            # Take the light back as soon as its manual override runs out
+            until_expiry = (
+                min(self._override_expiry.values()) - datetime.now(timezone.utc)
+            ).total_seconds()
+            cap = max(min(cap, until_expiry + 0.5), 0.5)
+        delay = seconds_until_next_boundary(datetime.now(), boundaries)
+        if delay is None:
+            return cap
+        # Land just past the boundary so tick() sees the new minute
+        return min(delay + 0.5, cap)
 
     async def tick(self, only_tent_id: str | None = None):
         """Evaluate every tent's light cycle and switch lights that are wrong.
@@ -255,75 +343,118 @@ class LightScheduler:
         Uses local wall-clock time (HA add-on containers inherit the host TZ).
         Only issues a command when the actuator's reported state is a definite
         mismatch ('on'/'off'), so unknown/unavailable entities are never spammed.
-        Entities with an active manual override are left alone.
+        Entities with an active manual override are left alone. A skipped
+        unknown state or a failed switch makes the loop retry soon.
         """
         now = datetime.now()
+        needs_retry = False
         now_minutes = now.hour * 60 + now.minute
 
-        for tent_id, tent in list(self.state_manager.tents.items()):
-            if only_tent_id and tent_id != only_tent_id:
-                continue
-
-            schedules = tent.config.schedules or {}
-            cycle = schedules.get("light_cycle") or {}
-            if not cycle.get("enabled"):
-                continue
+        tents = self.state_manager.tents
+        if only_tent_id:
+            tent = tents.get(only_tent_id)
+            targets = [(only_tent_id, tent)] if tent else []
+        else:
+            targets = list(tents.items())
 
-            on_time = cycle.get("on_time") or schedules.get("photoperiod_on") or "06:00"
+        for tent_id, tent in targets:
+            self._override_expiry.pop(tent_id, None)
             try:
-                hours = float(cycle.get("photoperiod_hours"))
-                desired = desired_light_state(now_minutes, on_time, hours)
+                cycle = self._compiled_cycle(tent_id, tent.config)
             except (TypeError, ValueError) as e:
                 logger.warning(f"Tent {tent_id}: invalid light cycle config: {e}")
                 continue
+            if cycle is None:
+                continue
+            desired = cycle.is_on(now_minutes)
 
-            light_slots = {
-                slot: entity_id
-                for slot, entity_id in tent.slot_to_entity.items()
-                if slot == "light" or slot.startswith("light_")
-            }
+            light_slots = tent.light_slots
             if not light_slots:
                 continue
 
             overridden = await self._active_override_entities(
                 tent_id, list(light_slots.values())
             )
+            expiries = [expires for expires in overridden.values() if expires is not None]
+            if expiries:
+                self._override_expiry[tent_id] = min(expiries)
 
+            # Switch mismatched lights concurrently rather than one RTT at a time
+            pending = []
             for slot, entity_id in light_slots.items():
                 if entity_id in overridden:
                     continue
                 actual = (tent.actuators.get(slot) or {}).get("state")
                 if actual not in ("on", "off"):
-                    continue  # unknown/unavailable — don't fight it
-                try:
-                    if desired and actual == "off":
-                        await self.ha_client.turn_on(entity_id)
-                        await self._log_event(
-                            tent_id,
-                            f"Light schedule: turned ON {entity_id} "
-                            f"({cycle.get('mode', '?')} {hours:g}h, on at {on_time})"
-                        )
-                    elif not desired and actual == "on":
-                        await self.ha_client.turn_off(entity_id)
-                        await self._log_event(
-                            tent_id,
-                            f"Light schedule: turned OFF {entity_id} "
-                            f"({cycle.get('mode', '?')} {hours:g}h, on at {on_time})"
-                        )
-                except Exception as e:
-                    logger.error(f"Tent {tent_id}: failed to switch {entity_id}: {e}")
+                    needs_retry = True
+                    continue  # unknown/unavailable — don't fight it, look again soon
+                if desired != (actual == "on"):
+                    pending.append(self._switch_light(tent_id, entity_id, desired, cycle))
+            if pending and not all(await asyncio.gather(*pending)):
+                needs_retry = True
+
+        if only_tent_id is None:
+            self._needs_retry = needs_retry
+        elif needs_retry:
+            self._needs_retry = True
+
+    async def _switch_light(
+        self, tent_id: str, entity_id: str, on: bool, cycle: CompiledLightCycle
+    ) -> bool:
+        """Switch one light to match the cycle and log it.
+
+        Errors are logged, not raised; returns whether the switch succeeded.
+        """
+        try:
+            if on:
+                await self.ha_client.turn_on(entity_id)
+            else:
+                await self.ha_client.turn_off(entity_id)
+            await self._log_event(
+                tent_id,
+                f"Light schedule: turned {'ON' if on else 'OFF'} {entity_id} "
+                f"({cycle.mode} {cycle.hours:g}h, on at {cycle.on_time})"
+            )
+        except Exception as e:
+            logger.error(f"Tent {tent_id}: failed to switch {entity_id}: {e}")
+            return False
+        return True
+
+    def _compiled_cycle(self, tent_id: str, config) -> CompiledLightCycle | None:
+        """Return the tent's compiled light cycle, or None when it is disabled.
+
+        Compiled once per TentConfig; reload_config() swaps in new config
+        objects, which invalidates the entry. Raises on an invalid cycle.
+        """
+        cached = self._cycles.get(tent_id)
+        if cached is not None and cached[0] is config:
+            return cached[1]
+
+        schedules = config.schedules or {}
+        cycle = schedules.get("light_cycle") or {}
+        compiled = None
+        if cycle.get("enabled"):
+            on_time = cycle.get("on_time") or schedules.get("photoperiod_on") or "06:00"
+            hours = float(cycle.get("photoperiod_hours"))
+            compiled = CompiledLightCycle(
+                cycle.get("mode", "?"), on_time, hours,
+                compile_light_cycle(on_time, hours),
+                light_cycle_boundaries(on_time, hours),
+            )
+        self._cycles[tent_id] = (config, compiled)
+        return compiled
 
     async def _active_override_entities(
         self, tent_id: str, entity_ids: list[str]
-    ) -> set[str]:
-        """Return the subset of entity_ids with an active manual override."""
+    ) -> dict[str, datetime | None]:
+        """Map each of entity_ids with an active manual override to its UTC expiry."""
         try:
             from sqlalchemy import select, and_, or_
             from database import async_session, Override
 
             async with async_session() as session:
                 result = await session.execute(
-                    select(Override.entity_id).where(
+                    select(Override.entity_id, Override.expires_at).where(
                         and_(
                             Override.tent_id == tent_id,
                             Override.entity_id.in_(entity_ids),
@@ -334,10 +465,17 @@ class LightScheduler:
                         )
                     )
                 )
-                return {row[0] for row in result.all()}
+                return {
+                    entity_id: (
+                        expires_at.replace(tzinfo=timezone.utc)
+                        if expires_at is not None and expires_at.tzinfo is None
+                        else expires_at
+                    )
+                    for entity_id, expires_at in result.all()
+                }
         except Exception as e:
             logger.warning(f"Override lookup failed for {tent_id}: {e}")
-            return set()
+            return {}
 
     async def _log_event(self, tent_id: str, notes: str):
         """Record a light_schedule event in the activity log."""
@@ -1,20 +1,33 @@
 """Tent Garden Manager - FastAPI Backend"""
 import asyncio
+import functools
 import logging
 import os
+import orjson
 import yaml
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import select
 
 from config import settings
 
+# libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 
+
+@functools.lru_cache(maxsize=1)
 def get_version():
-    """Read version from config.yaml."""
+    """Read version from config.yaml.
+
+    The version only changes with a new add-on image, so it is read once.
+    """
     config_paths = [
         "/app/config.yaml",  # Docker container path
         os.path.join(os.path.dirname(__file__), "../../config.yaml"),  # Local dev
@@ -23,7 +36,7 @@ def get_version():
     for path in config_paths:
         try:
             with open(path) as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=YamlLoader)
                 version = config.get("version", "1.0.0")
                 logging.info(f"Loaded version {version} from {path}")
                 return version
@@ -34,11 +47,15 @@ def get_version():
             continue
     logging.warning("Could not find config.yaml, using default version")
     return "1.0.0"
-from database import init_db, get_db
+from database import init_db, async_session, ChatMessage, ChatUser
 from ha_client import HAClient
 from light_scheduler import LightScheduler
 from routes import tents, events, alerts, system, config, automations, reports, updates, camera, chat
 from state_manager import StateManager
+from routes.chat import (
+    check_rate_limit, sanitize_content, generate_display_name,
+    is_developer, broadcast_chat_message
+)
 
 logging.basicConfig(
     level=getattr(logging, settings.log_level.upper()),
@@ -51,6 +68,31 @@ ha_client: HAClient | None = None
 state_manager: StateManager | None = None
 light_scheduler: LightScheduler | None = None
 
+# Outbound WebSocket updates queued within this window share one frame
+WS_BATCH_WINDOW = 0.02
+
+# Keepalive frames are matched and answered without parsing
+WS_PING_FRAME = '{"type":"ping"}'
+WS_PONG_FRAME = orjson.dumps({"type": "pong"})
+
+# Fire-and-forget startup tasks, referenced until done so they can't be collected
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _on_background_done(task: asyncio.Task):
+    """Drop a finished startup task and log it if it crashed."""
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background task %s failed", task.get_name(), exc_info=task.exception())
+
+
+def spawn_background(coro, name: str) -> asyncio.Task:
+    """Run a coroutine in the background, logging any exception it raises."""
+    task = asyncio.create_task(coro, name=name)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_background_done)
+    return task
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -73,21 +115,23 @@ async def lifespan(app: FastAPI):
     # Initialize light cycle scheduler
     light_scheduler = LightScheduler(ha_client, state_manager)
     app.state.light_scheduler = light_scheduler
+    state_manager.light_scheduler = light_scheduler
 
     # Connect to Home Assistant
     try:
         await ha_client.connect()
         logger.info("Connected to Home Assistant")
 
-        # Start state subscription
-        asyncio.create_task(state_manager.start())
+        # Start state subscription (loading the initial light states wakes
+        # the scheduler, whose first tick usually runs before they arrive)
+        spawn_background(state_manager.start(), "state_manager.start")
 
         # Start light cycle enforcement
         await light_scheduler.start()
 
         # Send one-time install ping
         from routes.telemetry import ping_install
-        asyncio.create_task(ping_install())
+        spawn_background(ping_install(), "ping_install")
     except Exception as e:
         logger.error(f"Failed to connect to Home Assistant: {e}")
 
@@ -95,6 +139,8 @@ async def lifespan(app: FastAPI):
 
     # Cleanup
     logger.info("Shutting down...")
+    for task in list(_background_tasks):
+        task.cancel()
     if light_scheduler:
         await light_scheduler.stop()
     if state_manager:
@@ -108,17 +154,20 @@ app = FastAPI(
     description="Monitor and automate indoor grow tents",
     version=get_version(),
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     root_path=os.environ.get("INGRESS_PATH", "")
 )
 
-# CORS for local development
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# CORS for local development only; ingress traffic is same-origin
+if not os.environ.get("INGRESS_PATH"):
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=list(settings.cors_origins),
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE"],
+        allow_headers=["Content-Type", "Authorization"],
+        max_age=86400,
+    )
 
 # Include routers
 app.include_router(tents.router, prefix="/api/tents", tags=["tents"])
@@ -133,43 +182,49 @@ app.include_router(camera.router, prefix="/api/camera", tags=["camera"])
 app.include_router(chat.router, prefix="/api/chat", tags=["chat"])
 
 
+# (ha_connected, encoded body) - only rebuilt when the HA connection flips
+_health_cache: tuple[bool, bytes] | None = None
+
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
+    global _health_cache
     standalone = settings.standalone_mode
-    return {
-        "status": "healthy",
-        "version": get_version(),
-        "mode": "standalone" if standalone else "home_assistant",
-        "ha_connected": False if standalone else (ha_client.connected if ha_client else False)
-    }
+    ha_connected = False if standalone else (ha_client.connected if ha_client else False)
+
+    if _health_cache is None or _health_cache[0] != ha_connected:
+        _health_cache = (ha_connected, orjson.dumps({
+            "status": "healthy",
+            "version": get_version(),
+            "mode": "standalone" if standalone else "home_assistant",
+            "ha_connected": ha_connected
+        }))
+
+    return Response(_health_cache[1], media_type="application/json")
 
 
 @app.get("/api/debug/climate")
 async def debug_climate():
     """Debug page for Climate - bypasses frontend caching."""
-    from fastapi.responses import HTMLResponse
+    from fastapi.responses import StreamingResponse
     from routes.config import load_config
-    import json as json_mod
 
-    cfg = load_config()
-    tents_data = []
-    if state_manager:
-        for tent in state_manager.tents.values():
-            tents_data.append({
-                "id": tent.id,
-                "name": tent.name,
-                "avg_temperature": getattr(tent, 'avg_temperature', None),
-                "avg_humidity": getattr(tent, 'avg_humidity', None),
-                "vpd": getattr(tent, 'vpd', None),
-                "sensors": {k: str(v) for k, v in (getattr(tent, 'sensors', {}) or {}).items()},
-                "actuators": {k: str(v) for k, v in (getattr(tent, 'actuators', {}) or {}).items()},
-            })
+    def pretty(value) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2)
+
+    cfg = await asyncio.to_thread(load_config)
+    tents_data = (
+        [tent.to_debug_dict() for tent in state_manager.tents.values()]
+        if state_manager else []
+    )
 
     config_dump = cfg.model_dump()
     version = get_version()
 
-    html = f"""<!DOCTYPE html>
+    async def gen():
+        # Each section is encoded only when the client is ready for it
+        yield f"""<!DOCTYPE html>
 <html><head><meta charset="utf-8"><title>TentOS Climate Debug</title>
 <style>body{{font-family:monospace;background:#111;color:#eee;padding:20px}}
 h1{{color:#facc15}}h2{{color:#4ade80;margin-top:20px}}
@@ -180,39 +235,40 @@ pre{{background:#1a1a2e;padding:10px;border-radius:5px;overflow-x:auto;white-spa
 <p>This page is served directly by the backend — no frontend caching.</p>
 
 <h2>Config Tents ({len(config_dump.get('tents', []))})</h2>
-<pre>{json_mod.dumps(config_dump.get('tents', []), indent=2)}</pre>
+<pre>""".encode()
+        yield pretty(config_dump.get('tents', []))
+        yield f"""</pre>
 
 <h2>Live Tents from StateManager ({len(tents_data)})</h2>
-<pre>{json_mod.dumps(tents_data, indent=2)}</pre>
+<pre>""".encode()
+        yield pretty(tents_data)
+        yield b"""</pre>
 
 <h2>Hidden Entities</h2>
-<pre>{json_mod.dumps(config_dump.get('hiddenEntities', []), indent=2)}</pre>
+<pre>"""
+        yield pretty(config_dump.get('hiddenEntities', []))
+        yield b"""</pre>
 
 <h2>Full Config</h2>
-<pre>{json_mod.dumps(config_dump, indent=2)}</pre>
+<pre>"""
+        yield pretty(config_dump)
+        yield b"""</pre>
 </body></html>"""
 
-    return HTMLResponse(content=html, headers={
+    return StreamingResponse(gen(), media_type="text/html", headers={
         "Cache-Control": "no-cache, no-store, must-revalidate",
         "Pragma": "no-cache",
         "Expires": "0"
     })
 
 
-async def handle_chat_message(websocket: WebSocket, msg: dict, state_manager):
+async def handle_chat_message(queue: asyncio.Queue, msg: dict, state_manager):
     """Handle incoming chat message via WebSocket."""
-    from routes.chat import (
-        check_rate_limit, sanitize_content, generate_display_name,
-        is_developer, broadcast_chat_message
-    )
-    from database import get_db, ChatMessage, ChatUser
-    from sqlalchemy import select
-
     session_id = msg.get("session_id", "")
     content = msg.get("content", "")
 
     if not session_id or not content:
-        await websocket.send_text(json.dumps({
+        await queue.put(orjson.dumps({
             "type": "chat_error",
             "error": "Missing session_id or content"
         }))
@@ -220,7 +276,7 @@ async def handle_chat_message(websocket: WebSocket, msg: dict, state_manager):
 
     # Rate limit
     if not check_rate_limit(session_id):
-        await websocket.send_text(json.dumps({
+        await queue.put(orjson.dumps({
             "type": "chat_error",
             "error": "Rate limited. Wait a moment."
         }))
@@ -231,7 +287,7 @@ async def handle_chat_message(websocket: WebSocket, msg: dict, state_manager):
     if not content:
         return
 
-    async for db_session in get_db():
+    async with async_session() as db_session:
         # Get or create user
         result = await db_session.execute(
             select(ChatUser).where(ChatUser.session_id == session_id)
@@ -246,7 +302,7 @@ async def handle_chat_message(websocket: WebSocket, msg: dict, state_manager):
 
         # Check if banned
         if user.is_banned:
-            await websocket.send_text(json.dumps({
+            await queue.put(orjson.dumps({
                 "type": "chat_error",
                 "error": "You have been banned from chat"
             }))
@@ -277,9 +333,84 @@ async def handle_chat_message(websocket: WebSocket, msg: dict, state_manager):
             "is_developer": message.is_developer
         }
 
-        disconnected = await broadcast_chat_message(state_manager.ws_clients, msg_data)
-        for ws in disconnected:
-            state_manager.ws_clients.remove(ws)
+        broadcast_chat_message(state_manager, msg_data)
+
+
+async def websocket_sender(websocket: WebSocket, queue: asyncio.Queue):
+    """Drain a client's outbound queue, sending one frame per flush window.
+
+    Messages queued within WS_BATCH_WINDOW of the first one are combined into
+    a single JSON array frame; a lone message is sent as-is. Queued messages
+    are pre-encoded bytes, so a batch is joined without re-serializing.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + WS_BATCH_WINDOW
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        if len(batch) == 1:
+            await websocket.send_bytes(batch[0])
+            continue
+
+        await websocket.send_bytes(b"[" + b",".join(batch) + b"]")
+
+
+async def ws_ping(websocket: WebSocket, queue: asyncio.Queue, msg: dict):
+    """Answer a client keepalive ping."""
+    await queue.put(WS_PONG_FRAME)
+
+
+async def ws_get_tent(websocket: WebSocket, queue: asyncio.Queue, msg: dict):
+    """Send the current state of one tent."""
+    tent_id = msg.get("tent_id")
+    tent = state_manager.get_tent(tent_id)
+    if tent:
+        await queue.put(orjson.dumps({
+            "type": "tent_state",
+            "tent_id": tent_id,
+            "data": orjson.Fragment(tent.to_json())
+        }))
+
+
+async def ws_chat_message(websocket: WebSocket, queue: asyncio.Queue, msg: dict):
+    """Handle real-time chat message."""
+    await handle_chat_message(queue, msg, state_manager)
+
+
+# Client command "type" -> handler; anything else is ignored
+WS_HANDLERS = {
+    "ping": ws_ping,
+    "get_tent": ws_get_tent,
+    "chat_message": ws_chat_message,
+}
+
+
+async def websocket_receiver(websocket: WebSocket, queue: asyncio.Queue):
+    """Handle incoming client commands.
+
+    Replies go through the client's outbound queue so websocket_sender stays
+    the only task writing to the socket after the initial snapshot.
+    """
+    async for data in websocket.iter_text():
+        if data == WS_PING_FRAME:
+            await queue.put(WS_PONG_FRAME)
+            continue
+
+        msg = orjson.loads(data) if data else {}
+
+        handler = WS_HANDLERS.get(msg.get("type"))
+        if handler is not None:
+            await handler(websocket, queue, msg)
+
+        logger.debug("Received WS message: %s", data)
 
 
 @app.websocket("/api/ws")
@@ -292,43 +423,27 @@ async def websocket_endpoint(websocket: WebSocket):
         return
 
     # Add client to broadcast list
-    state_manager.add_websocket_client(websocket)
+    queue = state_manager.add_websocket_client(websocket)
 
+    tasks = []
     try:
         # Send initial snapshot of all tents
-        import json
-        initial_data = {
-            "type": "initial_state",
-            "tents": state_manager.get_all_tents()
-        }
-        await websocket.send_text(json.dumps(initial_data))
-
-        while True:
-            # Keep connection alive, handle incoming messages
-            data = await websocket.receive_text()
-            msg = json.loads(data) if data else {}
-
-            # Handle client commands
-            if msg.get("type") == "ping":
-                await websocket.send_text(json.dumps({"type": "pong"}))
-            elif msg.get("type") == "get_tent":
-                tent_id = msg.get("tent_id")
-                tent = state_manager.get_tent(tent_id)
-                if tent:
-                    await websocket.send_text(json.dumps({
-                        "type": "tent_state",
-                        "tent_id": tent_id,
-                        "data": tent.to_dict()
-                    }))
-            elif msg.get("type") == "chat_message":
-                # Handle real-time chat message
-                await handle_chat_message(websocket, msg, state_manager)
-
-            logger.debug(f"Received WS message: {data}")
+        await websocket.send_bytes(state_manager.get_initial_state_bytes())
+
+        tasks = [
+            asyncio.create_task(websocket_receiver(websocket, queue)),
+            asyncio.create_task(websocket_sender(websocket, queue)),
+        ]
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
     except WebSocketDisconnect:
-        state_manager.remove_websocket_client(websocket)
+        pass
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
+    finally:
+        for task in tasks:
+            task.cancel()
         state_manager.remove_websocket_client(websocket)
 
 
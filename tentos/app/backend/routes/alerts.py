@@ -5,7 +5,7 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
-from sqlalchemy import select, and_, desc
+from sqlalchemy import select, and_, desc, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db, Alert
@@ -29,49 +29,58 @@ class AcknowledgeRequest(BaseModel):
 async def list_alerts(
     tent_id: Optional[str] = None,
     active_only: bool = True,
-    state_manager: StateManager = Depends(get_state_manager)
+    limit: int = 100,
+    offset: int = 0,
+    state_manager: StateManager = Depends(get_state_manager),
+    session: AsyncSession = Depends(get_db)
 ):
-    """List all current alerts."""
-    # Get live alerts from state manager
-    all_alerts = []
-
-    for tid, tent in state_manager.tents.items():
-        if tent_id and tid != tent_id:
-            continue
-
-        for alert in tent.alerts:
-            all_alerts.append({
-                "tent_id": tid,
-                "tent_name": tent.config.name,
-                **alert
-            })
+    """List all current alerts.
+
+    Live alerts are returned in full on the first page (offset 0) only;
+    limit and offset page the persisted alerts that follow them. count is
+    the number of alerts in this response, live and persisted together.
+    """
+    # Get live alerts from state manager; later pages carry persisted only
+    if offset:
+        tents = []
+    elif tent_id:
+        tent = state_manager.get_tent(tent_id)
+        tents = [tent] if tent else []
+    else:
+        tents = state_manager.tents.values()
+
+    all_alerts = [
+        {"tent_id": tent.config.id, "tent_name": tent.config.name, **alert}
+        for tent in tents
+        for alert in tent.alerts
+    ]
 
     # Also get persisted alerts from database
-    async for session in get_db():
-        query = select(Alert)
-
-        if tent_id:
-            query = query.where(Alert.tent_id == tent_id)
-        if active_only:
-            query = query.where(Alert.resolved_at.is_(None))
-
-        query = query.order_by(desc(Alert.created_at))
-
-        result = await session.execute(query)
-        db_alerts = result.scalars().all()
-
-        for alert in db_alerts:
-            all_alerts.append({
-                "id": alert.id,
-                "tent_id": alert.tent_id,
-                "type": alert.alert_type,
-                "severity": alert.severity,
-                "message": alert.message,
-                "created_at": alert.created_at.isoformat(),
-                "acknowledged_at": alert.acknowledged_at.isoformat() if alert.acknowledged_at else None,
-                "acknowledged_by": alert.acknowledged_by,
-                "persisted": True
-            })
+    # Compiled once per filter combination; see list_events
+    query = lambda_stmt(lambda: select(Alert))
+
+    if tent_id:
+        query += lambda s: s.where(Alert.tent_id == tent_id)
+    if active_only:
+        query += lambda s: s.where(Alert.resolved_at.is_(None))
+
+    query += lambda s: s.order_by(desc(Alert.created_at)).limit(limit).offset(offset)
+
+    result = await session.execute(query)
+    db_alerts = result.scalars().all()
+
+    for alert in db_alerts:
+        all_alerts.append({
+            "id": alert.id,
+            "tent_id": alert.tent_id,
+            "type": alert.alert_type,
+            "severity": alert.severity,
+            "message": alert.message,
+            "created_at": alert.created_at.isoformat(),
+            "acknowledged_at": alert.acknowledged_at.isoformat() if alert.acknowledged_at else None,
+            "acknowledged_by": alert.acknowledged_by,
+            "persisted": True
+        })
 
     return {"alerts": all_alerts, "count": len(all_alerts)}
 
@@ -79,19 +88,11 @@ async def list_alerts(
 @router.get("/summary")
 async def alerts_summary(state_manager: StateManager = Depends(get_state_manager)):
     """Get alert summary counts."""
-    critical = 0
-    warning = 0
-    info = 0
-
-    for tent in state_manager.tents.values():
-        for alert in tent.alerts:
-            severity = alert.get("severity", "warning")
-            if severity == "critical":
-                critical += 1
-            elif severity == "warning":
-                warning += 1
-            else:
-                info += 1
+    tents = state_manager.tents.values()
+    critical = sum(tent.severity_counts.get("critical", 0) for tent in tents)
+    warning = sum(tent.severity_counts.get("warning", 0) for tent in tents)
+    # Anything that isn't critical or a warning counts as info
+    info = sum(len(tent.alerts) for tent in tents) - critical - warning
 
     return {
         "critical": critical,
@@ -102,39 +103,35 @@ async def alerts_summary(state_manager: StateManager = Depends(get_state_manager
 
 
 @router.post("/{alert_id}/acknowledge")
-async def acknowledge_alert(alert_id: int, request_data: AcknowledgeRequest):
+async def acknowledge_alert(
+    alert_id: int,
+    request_data: AcknowledgeRequest,
+    session: AsyncSession = Depends(get_db)
+):
     """Acknowledge an alert."""
-    async for session in get_db():
-        result = await session.execute(
-            select(Alert).where(Alert.id == alert_id)
-        )
-        alert = result.scalar_one_or_none()
+    alert = await session.get(Alert, alert_id)
 
-        if not alert:
-            raise HTTPException(status_code=404, detail="Alert not found")
+    if not alert:
+        raise HTTPException(status_code=404, detail="Alert not found")
 
-        alert.acknowledged_at = datetime.now(timezone.utc)
-        alert.acknowledged_by = request_data.user
+    alert.acknowledged_at = datetime.now(timezone.utc)
+    alert.acknowledged_by = request_data.user
 
-        await session.commit()
+    await session.commit()
 
-        return {"success": True, "message": "Alert acknowledged"}
+    return {"success": True, "message": "Alert acknowledged"}
 
 
 @router.post("/{alert_id}/resolve")
-async def resolve_alert(alert_id: int):
+async def resolve_alert(alert_id: int, session: AsyncSession = Depends(get_db)):
     """Resolve an alert."""
-    async for session in get_db():
-        result = await session.execute(
-            select(Alert).where(Alert.id == alert_id)
-        )
-        alert = result.scalar_one_or_none()
+    alert = await session.get(Alert, alert_id)
 
-        if not alert:
-            raise HTTPException(status_code=404, detail="Alert not found")
+    if not alert:
+        raise HTTPException(status_code=404, detail="Alert not found")
 
-        alert.resolved_at = datetime.now(timezone.utc)
+    alert.resolved_at = datetime.now(timezone.utc)
 
-        await session.commit()
+    await session.commit()
 
-        return {"success": True, "message": "Alert resolved"}
+    return {"success": True, "message": "Alert resolved"}
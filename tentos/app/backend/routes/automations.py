@@ -1,8 +1,14 @@
 """Home Assistant Automation API routes."""
+import asyncio
+import functools
 import logging
+import re
 import time
+from itertools import chain
 from typing import Optional
+import orjson
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -73,6 +79,18 @@ TAGS = {
     "multi": {"name": "Multi-trigger", "icon": "⚡", "color": "red"},
 }
 
+# Static lookup tables sent with every automation listing
+CATEGORY_SUMMARY = {k: {"name": v["name"], "icon": v["icon"]} for k, v in CATEGORIES.items()}
+TAG_SUMMARY = {k: {"name": v["name"], "icon": v["icon"], "color": v["color"]} for k, v in TAGS.items()}
+
+# The category listing never changes, so it is encoded once at import
+CATEGORIES_JSON = orjson.dumps({
+    "categories": [
+        {"id": k, **{key: v[key] for key in ["name", "icon", "order"]}}
+        for k, v in sorted(CATEGORIES.items(), key=lambda x: x[1]["order"])
+    ]
+})
+
 
 def get_automation_tags(automation: dict, config: dict = None) -> list[str]:
     """Determine tags for an automation based on its triggers."""
@@ -130,8 +148,12 @@ def get_automation_tags(automation: dict, config: dict = None) -> list[str]:
     return unique_tags
 
 
-def categorize_automation(automation: dict, config: dict = None) -> str:
-    """Determine the category of an automation based on its config and name."""
+def categorize_automation(automation: dict, config: dict = None, config_text: str = None) -> str:
+    """Determine the category of an automation based on its config and name.
+
+    config_text is the config's lowercased text when the caller already has
+    it (see config_search_texts).
+    """
     entity_id = automation.get("entity_id", "")
     friendly_name = automation.get("attributes", {}).get("friendly_name", "")
     search_text = f"{entity_id} {friendly_name}".lower()
@@ -153,7 +175,7 @@ def categorize_automation(automation: dict, config: dict = None) -> str:
 
     # Check config for target entities
     if config:
-        config_str = str(config).lower()
+        config_str = config_text if config_text is not None else str(config).lower()
         # Check each category's keywords
         for cat_id, cat_info in CATEGORIES.items():
             if cat_id == "other":
@@ -322,6 +344,7 @@ def get_tent_entity_ids(tent) -> set[str]:
     """Get all entity IDs configured for a tent.
 
     Works with both TentState objects (tent.config.sensors) and TentConfig objects (tent.sensors).
+    Hot paths holding a TentState use the prebuilt tent.config.entity_id_set instead.
     """
     entity_ids = set()
 
@@ -336,24 +359,28 @@ def get_tent_entity_ids(tent) -> set[str]:
     else:
         return entity_ids
 
-    for sensor_type, val in sensors.items():
-        if isinstance(val, list):
-            entity_ids.update(e for e in val if e)
-        elif val:
-            entity_ids.add(val)
-    for actuator_type, val in actuators.items():
+    for val in chain(sensors.values(), actuators.values()):
         if isinstance(val, list):
-            entity_ids.update(e for e in val if e)
+            entity_ids.update(filter(None, val))
         elif val:
             entity_ids.add(val)
     return entity_ids
 
 
-def automation_references_entities(automation: dict, entity_ids: set[str], config: dict = None) -> bool:
+@functools.lru_cache(maxsize=32)
+def _entity_pattern(entity_ids: frozenset[str]) -> re.Pattern:
+    """Compile one case-folded alternation matching any of the entity IDs."""
+    return re.compile("|".join(re.escape(e.lower()) for e in sorted(entity_ids)))
+
+
+def automation_references_entities(
+    automation: dict, entity_ids: set[str], config: dict = None, config_text: str = None
+) -> bool:
     """Check if an automation references any of the given entities.
 
     Matches by exact entity_id in the automation config or automation entity_id/name.
-    Also matches tentos_ prefixed automations.
+    Also matches tentos_ prefixed automations. config_text is the config's
+    lowercased text when the caller already has it (see config_search_texts).
     """
     auto_id = automation.get("entity_id", "")
 
@@ -362,15 +389,22 @@ def automation_references_entities(automation: dict, entity_ids: set[str], confi
         return True
 
     # Check automation config for exact entity references
-    if config:
-        config_str = str(config).lower()
-        for entity_id in entity_ids:
-            if entity_id.lower() in config_str:
-                return True
+    if config and entity_ids:
+        # One regex scan per config instead of a substring scan per entity
+        pattern = _entity_pattern(frozenset(entity_ids))
+        if config_text is None:
+            config_text = str(config).lower()
+        if pattern.search(config_text):
+            return True
 
     return False
 
 
+def config_search_texts(configs: dict) -> dict[str, str]:
+    """Lowercased text of each automation config, built once per request."""
+    return {entity_id: str(config).lower() for entity_id, config in configs.items()}
+
+
 async def get_automation_configs(ha_client, automations: list) -> dict:
     """Fetch configs for automations to check entity references."""
     configs = {}
@@ -711,19 +745,22 @@ async def get_suggestions(request: Request):
     tents = list(state_manager.tents.values())  # Get TentState objects directly
     all_automations = await ha_client.get_automations()
     configs = await get_automation_configs(ha_client, all_automations)
+    config_texts = config_search_texts(configs)
 
     suggestions = []
 
     for tent in tents:
-        tent_entities = get_tent_entity_ids(tent)
+        tent_entities = tent.config.entity_id_set
         sensors = tent.config.sensors or {}
         actuators = tent.config.actuators or {}
 
         # Find automations that reference this tent's entities
         tent_automations = []
         for auto in all_automations:
-            config = configs.get(auto.get("entity_id"))
-            if automation_references_entities(auto, tent_entities, config):
+            auto_entity_id = auto.get("entity_id")
+            if automation_references_entities(
+                auto, tent_entities, configs.get(auto_entity_id), config_texts.get(auto_entity_id)
+            ):
                 tent_automations.append(auto)
 
         # Check each template to see if it's missing
@@ -1055,69 +1092,59 @@ class BulkOperation(BaseModel):
     entity_ids: list[str]
 
 
-@router.post("/bulk/enable")
-async def bulk_enable(data: BulkOperation, request: Request):
-    """Enable multiple automations at once."""
-    ha_client = request.app.state.ha_client
+async def _bulk_automation_service(
+    ha_client, entity_ids: list[str], service: str
+) -> tuple[list[str], list[dict]]:
+    """Call an automation.* service for each entity concurrently.
+
+    Returns (succeeded entity_ids, [{entity_id, error}]) in request order.
+    """
+    entity_ids = [
+        e if e.startswith("automation.") else f"automation.{e}"
+        for e in entity_ids
+    ]
+    outcomes = await asyncio.gather(
+        *(
+            ha_client.call_service("automation", service, target={"entity_id": e})
+            for e in entity_ids
+        ),
+        return_exceptions=True,
+    )
+
     results = []
     errors = []
-
-    for entity_id in data.entity_ids:
-        try:
-            if not entity_id.startswith("automation."):
-                entity_id = f"automation.{entity_id}"
-            await ha_client.call_service(
-                "automation", "turn_on",
-                target={"entity_id": entity_id}
-            )
+    for entity_id, outcome in zip(entity_ids, outcomes):
+        if isinstance(outcome, Exception):
+            errors.append({"entity_id": entity_id, "error": str(outcome)})
+        else:
             results.append(entity_id)
-        except Exception as e:
-            errors.append({"entity_id": entity_id, "error": str(e)})
+    return results, errors
+
 
+@router.post("/bulk/enable")
+async def bulk_enable(data: BulkOperation, request: Request):
+    """Enable multiple automations at once."""
+    results, errors = await _bulk_automation_service(
+        request.app.state.ha_client, data.entity_ids, "turn_on"
+    )
     return {"success": len(errors) == 0, "enabled": results, "errors": errors}
 
 
 @router.post("/bulk/disable")
 async def bulk_disable(data: BulkOperation, request: Request):
     """Disable multiple automations at once."""
-    ha_client = request.app.state.ha_client
-    results = []
-    errors = []
-
-    for entity_id in data.entity_ids:
-        try:
-            if not entity_id.startswith("automation."):
-                entity_id = f"automation.{entity_id}"
-            await ha_client.call_service(
-                "automation", "turn_off",
-                target={"entity_id": entity_id}
-            )
-            results.append(entity_id)
-        except Exception as e:
-            errors.append({"entity_id": entity_id, "error": str(e)})
-
+    results, errors = await _bulk_automation_service(
+        request.app.state.ha_client, data.entity_ids, "turn_off"
+    )
     return {"success": len(errors) == 0, "disabled": results, "errors": errors}
 
 
 @router.post("/bulk/trigger")
 async def bulk_trigger(data: BulkOperation, request: Request):
     """Trigger multiple automations at once."""
-    ha_client = request.app.state.ha_client
-    results = []
-    errors = []
-
-    for entity_id in data.entity_ids:
-        try:
-            if not entity_id.startswith("automation."):
-                entity_id = f"automation.{entity_id}"
-            await ha_client.call_service(
-                "automation", "trigger",
-                target={"entity_id": entity_id}
-            )
-            results.append(entity_id)
-        except Exception as e:
-            errors.append({"entity_id": entity_id, "error": str(e)})
-
+    results, errors = await _bulk_automation_service(
+        request.app.state.ha_client, data.entity_ids, "trigger"
+    )
     return {"success": len(errors) == 0, "triggered": results, "errors": errors}
 
 
@@ -1161,12 +1188,7 @@ async def get_history(request: Request, hours: int = 24, entity_id: Optional[str
 @router.get("/categories")
 async def list_categories():
     """List available automation categories."""
-    return {
-        "categories": [
-            {"id": k, **{key: v[key] for key in ["name", "icon", "order"]}}
-            for k, v in sorted(CATEGORIES.items(), key=lambda x: x[1]["order"])
-        ]
-    }
+    return Response(CATEGORIES_JSON, media_type="application/json")
 
 
 @router.get("")
@@ -1194,10 +1216,12 @@ async def list_ha_automations(
         except Exception as e:
             logger.warning(f"Could not fetch automation configs for categorization: {e}")
 
+    config_texts = config_search_texts(configs)
+
     # Add category and tags to each automation
     for auto in all_automations:
         config = configs.get(auto.get("entity_id"))
-        auto["category"] = categorize_automation(auto, config)
+        auto["category"] = categorize_automation(auto, config, config_texts.get(auto.get("entity_id")))
         auto["tags"] = get_automation_tags(auto, config)
 
     # Filter by tent if requested
@@ -1206,17 +1230,20 @@ async def list_ha_automations(
         if tent_id:
             tent = state_manager.get_tent(tent_id)
             if tent:
-                entity_ids = get_tent_entity_ids(tent)
+                entity_ids = tent.config.entity_id_set
         else:
             # No specific tent — collect entities from ALL tents
             for tent in state_manager.tents.values():
-                entity_ids.update(get_tent_entity_ids(tent))
+                entity_ids.update(tent.config.entity_id_set)
+            entity_ids = frozenset(entity_ids)
 
         if entity_ids:
             filtered = []
             for a in all_automations:
-                config = configs.get(a.get("entity_id"))
-                if automation_references_entities(a, entity_ids, config):
+                auto_entity_id = a.get("entity_id")
+                if automation_references_entities(
+                    a, entity_ids, configs.get(auto_entity_id), config_texts.get(auto_entity_id)
+                ):
                     filtered.append(a)
             all_automations = filtered
 
@@ -1234,13 +1261,14 @@ async def list_ha_automations(
         key=lambda x: CATEGORIES.get(x[0], {}).get("order", 99)
     )
 
-    return {
+    # Plain dicts from HA; skip FastAPI's jsonable_encoder pass
+    return ORJSONResponse({
         "automations": all_automations,
         "by_category": dict(sorted_categories),
-        "categories": {k: {"name": v["name"], "icon": v["icon"]} for k, v in CATEGORIES.items()},
-        "tags": {k: {"name": v["name"], "icon": v["icon"], "color": v["color"]} for k, v in TAGS.items()},
+        "categories": CATEGORY_SUMMARY,
+        "tags": TAG_SUMMARY,
         "count": len(all_automations)
-    }
+    })
 
 
 @router.get("/{entity_id:path}/config")
@@ -1,12 +1,12 @@
 """Developer chat API routes."""
 import html
-import json
 import logging
 import re
 from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Request, WebSocket
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket
 from pydantic import BaseModel, Field
 from sqlalchemy import select, desc, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -88,44 +88,48 @@ class MessageResponse(BaseModel):
 @router.get("/messages")
 async def get_messages(
     limit: int = 50,
-    before: Optional[int] = None
+    before: Optional[int] = None,
+    session: AsyncSession = Depends(get_db)
 ):
     """Get chat message history."""
-    async for session in get_db():
-        query = select(ChatMessage).where(ChatMessage.is_deleted == False)
+    query = select(ChatMessage).where(ChatMessage.is_deleted == False)
 
-        if before:
-            query = query.where(ChatMessage.id < before)
+    if before:
+        query = query.where(ChatMessage.id < before)
 
-        query = query.order_by(desc(ChatMessage.id)).limit(limit + 1)
+    query = query.order_by(desc(ChatMessage.id)).limit(limit + 1)
 
-        result = await session.execute(query)
-        messages = result.scalars().all()
+    result = await session.execute(query)
+    messages = result.scalars().all()
 
-        has_more = len(messages) > limit
-        if has_more:
-            messages = messages[:limit]
+    has_more = len(messages) > limit
+    if has_more:
+        messages = messages[:limit]
 
-        # Reverse to chronological order
-        messages = list(reversed(messages))
+    # Reverse to chronological order
+    messages = list(reversed(messages))
 
-        return {
-            "messages": [
-                {
-                    "id": m.id,
-                    "display_name": m.display_name,
-                    "content": m.content,
-                    "timestamp": m.timestamp.isoformat(),
-                    "is_developer": m.is_developer
-                }
-                for m in messages
-            ],
-            "has_more": has_more
-        }
+    return {
+        "messages": [
+            {
+                "id": m.id,
+                "display_name": m.display_name,
+                "content": m.content,
+                "timestamp": m.timestamp.isoformat(),
+                "is_developer": m.is_developer
+            }
+            for m in messages
+        ],
+        "has_more": has_more
+    }
 
 
 @router.post("/messages")
-async def send_message(msg: MessageCreate, request: Request):
+async def send_message(
+    msg: MessageCreate,
+    request: Request,
+    db_session: AsyncSession = Depends(get_db)
+):
     """Send a chat message."""
     session_id = msg.session_id
 
@@ -138,92 +142,94 @@ async def send_message(msg: MessageCreate, request: Request):
     if not content:
         raise HTTPException(status_code=400, detail="Message cannot be empty")
 
-    async for db_session in get_db():
-        # Get or create user
-        result = await db_session.execute(
-            select(ChatUser).where(ChatUser.session_id == session_id)
-        )
-        user = result.scalar_one_or_none()
-
-        # Try to get HA user info from request headers
-        ha_user_name = request.headers.get("X-Ingress-User") or request.headers.get("X-Ha-User")
-        ha_user_id = request.headers.get("X-Ingress-User-Id")
-
-        if not user:
-            user = ChatUser(
-                session_id=session_id,
-                ha_user_id=ha_user_id,
-                ha_user_name=ha_user_name
-            )
-            db_session.add(user)
-            await db_session.commit()
-            await db_session.refresh(user)
-        else:
-            # Update HA info if available
-            if ha_user_name and not user.ha_user_name:
-                user.ha_user_name = ha_user_name
-            if ha_user_id and not user.ha_user_id:
-                user.ha_user_id = ha_user_id
-            user.last_seen = datetime.now(timezone.utc)
-            await db_session.commit()
-
-        # Check if banned
-        if user.is_banned:
-            raise HTTPException(status_code=403, detail="You have been banned from chat")
-
-        # Create message
-        display_name = generate_display_name(session_id, user.nickname)
-        dev = is_developer(ha_user_name or user.ha_user_name)
-
-        message = ChatMessage(
+    # Get or create user
+    result = await db_session.execute(
+        select(ChatUser).where(ChatUser.session_id == session_id)
+    )
+    user = result.scalar_one_or_none()
+
+    # Try to get HA user info from request headers
+    ha_user_name = request.headers.get("X-Ingress-User") or request.headers.get("X-Ha-User")
+    ha_user_id = request.headers.get("X-Ingress-User-Id")
+
+    if not user:
+        user = ChatUser(
             session_id=session_id,
-            ha_user_id=ha_user_id or user.ha_user_id,
-            ha_user_name=ha_user_name or user.ha_user_name,
-            display_name=display_name,
-            content=content,
-            is_developer=dev
+            ha_user_id=ha_user_id,
+            ha_user_name=ha_user_name
         )
-        db_session.add(message)
+        db_session.add(user)
+        await db_session.commit()
+        await db_session.refresh(user)
+    else:
+        # Update HA info if available
+        if ha_user_name and not user.ha_user_name:
+            user.ha_user_name = ha_user_name
+        if ha_user_id and not user.ha_user_id:
+            user.ha_user_id = ha_user_id
+        user.last_seen = datetime.now(timezone.utc)
         await db_session.commit()
-        await db_session.refresh(message)
 
-        return {
-            "id": message.id,
-            "display_name": message.display_name,
-            "content": message.content,
-            "timestamp": message.timestamp.isoformat(),
-            "is_developer": message.is_developer
-        }
+    # Check if banned
+    if user.is_banned:
+        raise HTTPException(status_code=403, detail="You have been banned from chat")
+
+    # Create message
+    display_name = generate_display_name(session_id, user.nickname)
+    dev = is_developer(ha_user_name or user.ha_user_name)
+
+    message = ChatMessage(
+        session_id=session_id,
+        ha_user_id=ha_user_id or user.ha_user_id,
+        ha_user_name=ha_user_name or user.ha_user_name,
+        display_name=display_name,
+        content=content,
+        is_developer=dev
+    )
+    db_session.add(message)
+    await db_session.commit()
+    await db_session.refresh(message)
+
+    return {
+        "id": message.id,
+        "display_name": message.display_name,
+        "content": message.content,
+        "timestamp": message.timestamp.isoformat(),
+        "is_developer": message.is_developer
+    }
 
 
 @router.get("/user")
-async def get_user(session_id: str):
+async def get_user(session_id: str, db_session: AsyncSession = Depends(get_db)):
     """Get current user profile."""
-    async for db_session in get_db():
-        result = await db_session.execute(
-            select(ChatUser).where(ChatUser.session_id == session_id)
-        )
-        user = result.scalar_one_or_none()
-
-        if not user:
-            # Return default for new user
-            return {
-                "session_id": session_id,
-                "display_name": generate_display_name(session_id),
-                "nickname": None,
-                "is_banned": False
-            }
+    result = await db_session.execute(
+        select(ChatUser).where(ChatUser.session_id == session_id)
+    )
+    user = result.scalar_one_or_none()
 
+    if not user:
+        # Return default for new user
         return {
-            "session_id": user.session_id,
-            "display_name": generate_display_name(session_id, user.nickname),
-            "nickname": user.nickname,
-            "is_banned": user.is_banned
+            "session_id": session_id,
+            "display_name": generate_display_name(session_id),
+            "nickname": None,
+            "is_banned": False
         }
 
+    return {
+        "session_id": user.session_id,
+        "display_name": generate_display_name(session_id, user.nickname),
+        "nickname": user.nickname,
+        "is_banned": user.is_banned
+    }
+
 
 @router.put("/user/nickname")
-async def update_nickname(data: NicknameUpdate, session_id: str):
+async def update_nickname(
+    data: NicknameUpdate,
+    session_id: str,
+    db_session: AsyncSession = Depends(get_db)
+):
     """Update user nickname."""
     nickname = data.nickname.strip()
 
@@ -231,173 +237,178 @@ async def update_nickname(data: NicknameUpdate, session_id: str):
     if not re.match(r'^[\w\s-]+$', nickname):
         raise HTTPException(status_code=400, detail="Nickname can only contain letters, numbers, spaces, and hyphens")
 
-    async for db_session in get_db():
-        result = await db_session.execute(
-            select(ChatUser).where(ChatUser.session_id == session_id)
-        )
-        user = result.scalar_one_or_none()
+    result = await db_session.execute(
+        select(ChatUser).where(ChatUser.session_id == session_id)
+    )
+    user = result.scalar_one_or_none()
 
-        if not user:
-            user = ChatUser(session_id=session_id, nickname=nickname)
-            db_session.add(user)
-        else:
-            user.nickname = nickname
+    if not user:
+        user = ChatUser(session_id=session_id, nickname=nickname)
+        db_session.add(user)
+    else:
+        user.nickname = nickname
 
-        await db_session.commit()
+    await db_session.commit()
 
-        return {
-            "success": True,
-            "display_name": generate_display_name(session_id, nickname)
-        }
+    return {
+        "success": True,
+        "display_name": generate_display_name(session_id, nickname)
+    }
 
 
 # === Developer-only endpoints ===
 
 @router.get("/admin/users")
-async def list_users(dev_session_id: str, request: Request):
+async def list_users(
+    dev_session_id: str,
+    request: Request,
+    db_session: AsyncSession = Depends(get_db)
+):
     """List all chat users with HA info (developer only)."""
     # Verify developer
-    async for db_session in get_db():
-        result = await db_session.execute(
-            select(ChatUser).where(ChatUser.session_id == dev_session_id)
+    result = await db_session.execute(
+        select(ChatUser).where(ChatUser.session_id == dev_session_id)
+    )
+    dev_user = result.scalar_one_or_none()
+
+    ha_user = request.headers.get("X-Ingress-User") or (dev_user.ha_user_name if dev_user else None)
+    if not is_developer(ha_user):
+        raise HTTPException(status_code=403, detail="Developer access required")
+
+    # Get all users with message counts
+    result = await db_session.execute(
+        select(
+            ChatUser,
+            func.count(ChatMessage.id).label('message_count')
         )
-        dev_user = result.scalar_one_or_none()
-
-        ha_user = request.headers.get("X-Ingress-User") or (dev_user.ha_user_name if dev_user else None)
-        if not is_developer(ha_user):
-            raise HTTPException(status_code=403, detail="Developer access required")
-
-        # Get all users with message counts
-        result = await db_session.execute(
-            select(
-                ChatUser,
-                func.count(ChatMessage.id).label('message_count')
-            )
-            .outerjoin(ChatMessage, ChatUser.session_id == ChatMessage.session_id)
-            .group_by(ChatUser.id)
-            .order_by(desc(ChatUser.last_seen))
-        )
-        rows = result.all()
-
-        return {
-            "users": [
-                {
-                    "id": user.id,
-                    "session_id": user.session_id,
-                    "ha_user_id": user.ha_user_id,
-                    "ha_user_name": user.ha_user_name,
-                    "nickname": user.nickname,
-                    "display_name": generate_display_name(user.session_id, user.nickname),
-                    "message_count": count,
-                    "created_at": user.created_at.isoformat(),
-                    "last_seen": user.last_seen.isoformat() if user.last_seen else None,
-                    "is_banned": user.is_banned
-                }
-                for user, count in rows
-            ]
-        }
+        .outerjoin(ChatMessage, ChatUser.session_id == ChatMessage.session_id)
+        .group_by(ChatUser.id)
+        .order_by(desc(ChatUser.last_seen))
+    )
+    rows = result.all()
+
+    return {
+        "users": [
+            {
+                "id": user.id,
+                "session_id": user.session_id,
+                "ha_user_id": user.ha_user_id,
+                "ha_user_name": user.ha_user_name,
+                "nickname": user.nickname,
+                "display_name": generate_display_name(user.session_id, user.nickname),
+                "message_count": count,
+                "created_at": user.created_at.isoformat(),
+                "last_seen": user.last_seen.isoformat() if user.last_seen else None,
+                "is_banned": user.is_banned
+            }
+            for user, count in rows
+        ]
+    }
 
 
 @router.post("/admin/ban/{session_id}")
-async def ban_user(session_id: str, dev_session_id: str, request: Request):
+async def ban_user(
+    session_id: str,
+    dev_session_id: str,
+    request: Request,
+    db_session: AsyncSession = Depends(get_db)
+):
     """Ban a user (developer only)."""
-    async for db_session in get_db():
-        # Verify developer
-        result = await db_session.execute(
-            select(ChatUser).where(ChatUser.session_id == dev_session_id)
-        )
-        dev_user = result.scalar_one_or_none()
+    # Verify developer
+    result = await db_session.execute(
+        select(ChatUser).where(ChatUser.session_id == dev_session_id)
+    )
+    dev_user = result.scalar_one_or_none()
 
-        ha_user = request.headers.get("X-Ingress-User") or (dev_user.ha_user_name if dev_user else None)
-        if not is_developer(ha_user):
-            raise HTTPException(status_code=403, detail="Developer access required")
+    ha_user = request.headers.get("X-Ingress-User") or (dev_user.ha_user_name if dev_user else None)
+    if not is_developer(ha_user):
+        raise HTTPException(status_code=403, detail="Developer access required")
 
-        # Find and ban user
-        result = await db_session.execute(
-            select(ChatUser).where(ChatUser.session_id == session_id)
-        )
-        user = result.scalar_one_or_none()
+    # Find and ban user
+    result = await db_session.execute(
+        select(ChatUser).where(ChatUser.session_id == session_id)
+    )
+    user = result.scalar_one_or_none()
 
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
 
-        user.is_banned = True
-        await db_session.commit()
+    user.is_banned = True
+    await db_session.commit()
 
-        return {"success": True, "message": f"User {session_id} banned"}
+    return {"success": True, "message": f"User {session_id} banned"}
 
 
 @router.post("/admin/unban/{session_id}")
-async def unban_user(session_id: str, dev_session_id: str, request: Request):
+async def unban_user(
+    session_id: str,
+    dev_session_id: str,
+    request: Request,
+    db_session: AsyncSession = Depends(get_db)
+):
     """Unban a user (developer only)."""
-    async for db_session in get_db():
-        # Verify developer
-        result = await db_session.execute(
-            select(ChatUser).where(ChatUser.session_id == dev_session_id)
-        )
-        dev_user = result.scalar_one_or_none()
+    # Verify developer
+    result = await db_session.execute(
+        select(ChatUser).where(ChatUser.session_id == dev_session_id)
+    )
+    dev_user = result.scalar_one_or_none()
 
-        ha_user = request.headers.get("X-Ingress-User") or (dev_user.ha_user_name if dev_user else None)
-        if not is_developer(ha_user):
-            raise HTTPException(status_code=403, detail="Developer access required")
+    ha_user = request.headers.get("X-Ingress-User") or (dev_user.ha_user_name if dev_user else None)
+    if not is_developer(ha_user):
+        raise HTTPException(status_code=403, detail="Developer access required")
 
-        # Find and unban user
-        result = await db_session.execute(
-            select(ChatUser).where(ChatUser.session_id == session_id)
-        )
-        user = result.scalar_one_or_none()
+    # Find and unban user
+    result = await db_session.execute(
+        select(ChatUser).where(ChatUser.session_id == session_id)
+    )
+    user = result.scalar_one_or_none()
 
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
 
-        user.is_banned = False
-        await db_session.commit()
+    user.is_banned = False
+    await db_session.commit()
 
-        return {"success": True, "message": f"User {session_id} unbanned"}
+    return {"success": True, "message": f"User {session_id} unbanned"}
 
 
 @router.delete("/admin/messages/{message_id}")
-async def delete_message(message_id: int, dev_session_id: str, request: Request):
+async def delete_message(
+    message_id: int,
+    dev_session_id: str,
+    request: Request,
+    db_session: AsyncSession = Depends(get_db)
+):
     """Delete a message (developer only)."""
-    async for db_session in get_db():
-        # Verify developer
-        result = await db_session.execute(
-            select(ChatUser).where(ChatUser.session_id == dev_session_id)
-        )
-        dev_user = result.scalar_one_or_none()
+    # Verify developer
+    result = await db_session.execute(
+        select(ChatUser).where(ChatUser.session_id == dev_session_id)
+    )
+    dev_user = result.scalar_one_or_none()
 
-        ha_user = request.headers.get("X-Ingress-User") or (dev_user.ha_user_name if dev_user else None)
-        if not is_developer(ha_user):
-            raise HTTPException(status_code=403, detail="Developer access required")
+    ha_user = request.headers.get("X-Ingress-User") or (dev_user.ha_user_name if dev_user else None)
+    if not is_developer(ha_user):
+        raise HTTPException(status_code=403, detail="Developer access required")
 
-        # Find and soft-delete message
-        result = await db_session.execute(
-            select(ChatMessage).where(ChatMessage.id == message_id)
-        )
-        message = result.scalar_one_or_none()
+    # Find and soft-delete message
+    result = await db_session.execute(
+        select(ChatMessage).where(ChatMessage.id == message_id)
+    )
+    message = result.scalar_one_or_none()
 
-        if not message:
-            raise HTTPException(status_code=404, detail="Message not found")
+    if not message:
+        raise HTTPException(status_code=404, detail="Message not found")
 
-        message.is_deleted = True
-        await db_session.commit()
+    message.is_deleted = True
+    await db_session.commit()
 
-        return {"success": True, "message": "Message deleted"}
+    return {"success": True, "message": "Message deleted"}
 
 
 # WebSocket broadcast helper (called from main.py)
-async def broadcast_chat_message(ws_clients: list, message: dict):
+def broadcast_chat_message(state_manager, message: dict):
     """Broadcast a chat message to all WebSocket clients."""
-    payload = json.dumps({
+    state_manager.broadcast(orjson.dumps({
         "type": "chat_new_message",
         "message": message
-    })
-
-    disconnected = []
-    for ws in ws_clients:
-        try:
-            await ws.send_text(payload)
-        except Exception:
-            disconnected.append(ws)
-
-    return disconnected
+    }))
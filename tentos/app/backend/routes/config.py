@@ -1,12 +1,14 @@
 """Configuration API routes for visual tent builder."""
-import json
+import asyncio
 import logging
 import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+import orjson
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -193,12 +195,11 @@ def _load_tents_from_options() -> list[TentConfig]:
     if not options_path.exists():
         return []
     try:
-        with open(options_path) as f:
-            options = json.load(f)
+        options = orjson.loads(options_path.read_bytes())
         tents = []
         for t in options.get("tents", []):
             tent_id = t.get("name", "").lower().replace(" ", "_")
-            tents.append(TentConfig(
+            tents.append(TentConfig.model_construct(
                 id=tent_id,
                 name=t.get("name", ""),
                 description=t.get("description", ""),
@@ -233,9 +234,10 @@ def load_config() -> AppConfig:
     app_config = None
     if CONFIG_PATH.exists():
         try:
-            with open(CONFIG_PATH) as f:
-                data = json.load(f)
-                app_config = AppConfig(**data)
+            data = orjson.loads(CONFIG_PATH.read_bytes())
+            # config.json is hand-editable, so it is validated; a bad file is
+            # logged and options.json is used instead
+            app_config = AppConfig.model_validate(data)
         except Exception as e:
             logger.error(f"Failed to load config: {e}")
 
@@ -276,16 +278,24 @@ def load_config() -> AppConfig:
 
 
 def save_config(config: AppConfig) -> bool:
-    """Save configuration atomically with backup."""
+    """Save configuration atomically with backup.
+
+    Unchanged configs are not rewritten, so the backup keeps the last real
+    edit. Blocking file I/O: call via asyncio.to_thread from request handlers.
+    """
     try:
+        payload = orjson.dumps(config.model_dump(), option=orjson.OPT_INDENT_2)
+
         # Backup existing config
         if CONFIG_PATH.exists():
+            if CONFIG_PATH.read_bytes() == payload:
+                logger.info("Configuration unchanged, skipping write")
+                return True
             shutil.copy(CONFIG_PATH, CONFIG_BACKUP_PATH)
 
         # Write new config atomically
         temp_path = CONFIG_PATH.with_suffix(".tmp")
-        with open(temp_path, "w") as f:
-            json.dump(config.model_dump(), f, indent=2)
+        temp_path.write_bytes(payload)
 
         temp_path.rename(CONFIG_PATH)
         logger.info("Configuration saved successfully")
@@ -304,14 +314,15 @@ async def get_slot_definitions():
 @router.get("")
 async def get_config():
     """Get current configuration."""
-    config = load_config()
-    return config.model_dump()
+    config = await asyncio.to_thread(load_config)
+    # pydantic-core renders the JSON directly, skipping jsonable_encoder
+    return Response(config.model_dump_json(), media_type="application/json")
 
 
 @router.put("")
 async def update_config(config: AppConfig, request: Request):
     """Update and save configuration."""
-    if save_config(config):
+    if await asyncio.to_thread(save_config, config):
         # Reload state manager to pick up new config
         state_manager = getattr(request.app.state, "state_manager", None)
         if state_manager:
@@ -326,7 +337,7 @@ async def update_config(config: AppConfig, request: Request):
 @router.post("/tents")
 async def create_tent(tent: TentConfig, request: Request):
     """Create a new tent."""
-    config = load_config()
+    config = await asyncio.to_thread(load_config)
 
     # Check for duplicate ID
     if any(t.id == tent.id for t in config.tents):
@@ -340,7 +351,7 @@ async def create_tent(tent: TentConfig, request: Request):
 
     config.tents.append(tent)
 
-    if save_config(config):
+    if await asyncio.to_thread(save_config, config):
         # Reload state manager to pick up new config
         state_manager = getattr(request.app.state, "state_manager", None)
         if state_manager:
@@ -348,19 +359,19 @@ async def create_tent(tent: TentConfig, request: Request):
                 await state_manager.reload_config()
             except Exception as e:
                 logger.warning(f"Failed to reload state manager: {e}")
-        return {"success": True, "tent": tent.model_dump()}
+        return ORJSONResponse({"success": True, "tent": orjson.Fragment(tent.model_dump_json())})
     raise HTTPException(status_code=500, detail="Failed to save tent")
 
 
 @router.put("/tents/{tent_id}")
 async def update_tent(tent_id: str, tent: TentConfig, request: Request):
     """Update an existing tent."""
-    config = load_config()
+    config = await asyncio.to_thread(load_config)
 
     for i, t in enumerate(config.tents):
         if t.id == tent_id:
             config.tents[i] = tent
-            if save_config(config):
+            if await asyncio.to_thread(save_config, config):
                 # Reload state manager to pick up new entity mappings
                 state_manager = getattr(request.app.state, "state_manager", None)
                 if state_manager:
@@ -368,7 +379,7 @@ async def update_tent(tent_id: str, tent: TentConfig, request: Request):
                         await state_manager.reload_config()
                     except Exception as e:
                         logger.warning(f"Failed to reload state manager: {e}")
-                return {"success": True, "tent": tent.model_dump()}
+                return ORJSONResponse({"success": True, "tent": orjson.Fragment(tent.model_dump_json())})
             raise HTTPException(status_code=500, detail="Failed to save tent")
 
     raise HTTPException(status_code=404, detail="Tent not found")
@@ -377,7 +388,7 @@ async def update_tent(tent_id: str, tent: TentConfig, request: Request):
 @router.delete("/tents/{tent_id}")
 async def delete_tent(tent_id: str, request: Request):
     """Delete a tent."""
-    config = load_config()
+    config = await asyncio.to_thread(load_config)
 
     original_len = len(config.tents)
     config.tents = [t for t in config.tents if t.id != tent_id]
@@ -385,7 +396,7 @@ async def delete_tent(tent_id: str, request: Request):
     if len(config.tents) == original_len:
         raise HTTPException(status_code=404, detail="Tent not found")
 
-    if save_config(config):
+    if await asyncio.to_thread(save_config, config):
         # Reload state manager to remove deleted tent
         state_manager = getattr(request.app.state, "state_manager", None)
         if state_manager:
@@ -1,11 +1,14 @@
 """Event logging API routes."""
 import logging
 from datetime import datetime, timezone, timedelta
+from itertools import chain
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
-from sqlalchemy import select, and_, desc
+from sqlalchemy import select, and_, or_, desc, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db, Event
@@ -32,14 +35,9 @@ def get_tent_entity_ids(tent) -> set[str]:
     else:
         return entity_ids
 
-    for sensor_type, val in sensors.items():
+    for val in chain(sensors.values(), actuators.values()):
         if isinstance(val, list):
-            entity_ids.update(e for e in val if e)
-        elif val:
-            entity_ids.add(val)
-    for actuator_type, val in actuators.items():
-        if isinstance(val, list):
-            entity_ids.update(e for e in val if e)
+            entity_ids.update(filter(None, val))
         elif val:
             entity_ids.add(val)
     return entity_ids
@@ -64,84 +62,143 @@ class EventResponse(BaseModel):
     user: Optional[str]
 
 
-@router.post("")
-async def create_event(event_data: EventCreate):
+def format_event_time(ms: int) -> str:
+    """Format an epoch-milliseconds event timestamp as ISO 8601 UTC."""
+    return datetime.fromtimestamp(ms / 1000, timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def format_event_cursor(event: Event) -> str:
+    """Encode an event's (timestamp, id) position as a pagination cursor."""
+    return f"{format_event_time(event.timestamp)}_{event.id}"
+
+
+def parse_event_cursor(value: str) -> tuple[int, int | None]:
+    """Parse a pagination cursor to (epoch ms, event id).
+
+    Cursors are '<ISO 8601>_<id>' as issued in next_cursor; a bare ISO 8601
+    or epoch-milliseconds timestamp is also accepted, with no id tiebreak.
+    """
+    value, sep, event_id = value.partition("_")
+    if sep and not event_id.isdigit():
+        raise ValueError(f"Invalid event id in cursor: {event_id!r}")
+    if value.isdigit():
+        ms = int(value)
+    else:
+        ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        ms = int(ts.timestamp() * 1000)
+    return ms, int(event_id) if sep else None
+
+
+def serialize_event(event: Event) -> dict:
+    """Build the public payload for an event row.
+
+    Rows come straight from the database, so the dict is handed to
+    ORJSONResponse as-is instead of being revalidated through EventResponse.
+    """
+    return {
+        "id": event.id,
+        "tent_id": event.tent_id,
+        "event_type": event.event_type,
+        "timestamp": format_event_time(event.timestamp),
+        "notes": event.notes,
+        "user": event.user
+    }
+
+
+@router.post("", response_model=EventResponse)
+async def create_event(event_data: EventCreate, session: AsyncSession = Depends(get_db)):
     """Log a manual event."""
-    import json
-
-    async for session in get_db():
-        event = Event(
-            tent_id=event_data.tent_id,
-            event_type=event_data.event_type,
-            notes=event_data.notes,
-            user=event_data.user,
-            data=json.dumps(event_data.data) if event_data.data else None
-        )
-        session.add(event)
-        await session.commit()
-        await session.refresh(event)
+    event = Event(
+        tent_id=event_data.tent_id,
+        event_type=event_data.event_type,
+        notes=event_data.notes,
+        user=event_data.user,
+        data=event_data.data or None
+    )
+    session.add(event)
+    await session.commit()
+    await session.refresh(event)
 
-        return {
-            "id": event.id,
-            "tent_id": event.tent_id,
-            "event_type": event.event_type,
-            "timestamp": event.timestamp.isoformat(),
-            "notes": event.notes,
-            "user": event.user
-        }
+    return ORJSONResponse(serialize_event(event))
 
 
 @router.get("")
 async def list_events(
     tent_id: Optional[str] = None,
     event_type: Optional[str] = None,
-    limit: int = 50,
-    offset: int = 0
+    limit: int = Query(default=50, ge=1),
+    offset: int = Query(default=0, ge=0),
+    before: Optional[str] = None,
+    session: AsyncSession = Depends(get_db)
 ):
-    """List events with optional filtering."""
-    async for session in get_db():
-        query = select(Event)
-
-        if tent_id:
-            query = query.where(Event.tent_id == tent_id)
-        if event_type:
-            query = query.where(Event.event_type == event_type)
-
-        query = query.order_by(desc(Event.timestamp)).limit(limit).offset(offset)
+    """List events with optional filtering.
 
-        result = await session.execute(query)
-        events = result.scalars().all()
-
-        return {
-            "events": [
-                {
-                    "id": e.id,
-                    "tent_id": e.tent_id,
-                    "event_type": e.event_type,
-                    "timestamp": e.timestamp.isoformat(),
-                    "notes": e.notes,
-                    "user": e.user
-                }
-                for e in events
-            ],
-            "limit": limit,
-            "offset": offset
-        }
+    Pass the previous page's next_cursor as `before` to page by
+    (timestamp, id) (keyset pagination) instead of scanning past `offset`
+    rows. next_cursor is null on the last page.
+    """
+    before_ts = before_id = None
+    if before:
+        try:
+            before_ts, before_id = parse_event_cursor(before)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid before cursor")
+
+    # Lambda statements are compiled once per filter combination and cached;
+    # later calls only bind the closure values as parameters.
+    query = lambda_stmt(lambda: select(Event))
+
+    if tent_id:
+        query += lambda s: s.where(Event.tent_id == tent_id)
+    if event_type:
+        query += lambda s: s.where(Event.event_type == event_type)
+    if before_id is not None:
+        # Events sharing the cursor's millisecond are split by id
+        query += lambda s: s.where(or_(
+            Event.timestamp < before_ts,
+            and_(Event.timestamp == before_ts, Event.id < before_id)
+        ))
+    elif before_ts is not None:
+        query += lambda s: s.where(Event.timestamp < before_ts)
+
+    # One extra row tells us whether another page exists
+    fetch = limit + 1
+    query += lambda s: s.order_by(desc(Event.timestamp), desc(Event.id)).limit(fetch).offset(offset)
+
+    result = await session.execute(query)
+    events = result.scalars().all()
+
+    has_more = len(events) > limit
+    if has_more:
+        events = events[:limit]
+
+    return ORJSONResponse({
+        "events": [serialize_event(e) for e in events],
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": format_event_cursor(events[-1]) if has_more else None
+    })
+
+
+# Static payload, encoded once at import
+EVENT_TYPES_JSON = orjson.dumps({
+    "types": [
+        {"id": "watering", "label": "Watering", "icon": "water"},
+        {"id": "refill", "label": "Reservoir Refill", "icon": "bucket"},
+        {"id": "filter_change", "label": "Filter Change", "icon": "air-filter"},
+        {"id": "solution_change", "label": "Solution Change", "icon": "flask"},
+        {"id": "maintenance", "label": "Maintenance", "icon": "wrench"},
+        {"id": "note", "label": "Note", "icon": "note"},
+    ]
+})
 
 
 @router.get("/types")
 async def get_event_types():
     """Get available event types."""
-    return {
-        "types": [
-            {"id": "watering", "label": "Watering", "icon": "water"},
-            {"id": "refill", "label": "Reservoir Refill", "icon": "bucket"},
-            {"id": "filter_change", "label": "Filter Change", "icon": "air-filter"},
-            {"id": "solution_change", "label": "Solution Change", "icon": "flask"},
-            {"id": "maintenance", "label": "Maintenance", "icon": "wrench"},
-            {"id": "note", "label": "Note", "icon": "note"},
-        ]
-    }
+    return Response(EVENT_TYPES_JSON, media_type="application/json")
 
 
 # ==================== Home Assistant Entity History ====================
@@ -257,7 +314,8 @@ async def get_ha_entity_history(
                     continue
 
                 # Determine event type based on entity domain
-                domain = entity.split(".")[0] if "." in entity else ""
+                domain_part, sep, _ = entity.partition(".")
+                domain = domain_part if sep else ""
                 friendly_name = state_entry.get("attributes", {}).get("friendly_name", entity)
 
                 # Skip sensor readings - we only want device state changes
@@ -338,41 +396,33 @@ async def get_ha_entity_history(
 # NOTE: These MUST be after /ha-history and /types to avoid route conflicts
 
 @router.get("/{event_id}")
-async def get_event(event_id: int):
+async def get_event(event_id: int, session: AsyncSession = Depends(get_db)):
     """Get a specific event."""
-    async for session in get_db():
-        result = await session.execute(
-            select(Event).where(Event.id == event_id)
-        )
-        event = result.scalar_one_or_none()
+    event = await session.get(Event, event_id)
 
-        if not event:
-            raise HTTPException(status_code=404, detail="Event not found")
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
 
-        return {
-            "id": event.id,
-            "tent_id": event.tent_id,
-            "event_type": event.event_type,
-            "timestamp": event.timestamp.isoformat(),
-            "notes": event.notes,
-            "user": event.user,
-            "data": event.data
-        }
+    return {
+        "id": event.id,
+        "tent_id": event.tent_id,
+        "event_type": event.event_type,
+        "timestamp": format_event_time(event.timestamp),
+        "notes": event.notes,
+        "user": event.user,
+        "data": event.data
+    }
 
 
 @router.delete("/{event_id}")
-async def delete_event(event_id: int):
+async def delete_event(event_id: int, session: AsyncSession = Depends(get_db)):
     """Delete an event."""
-    async for session in get_db():
-        result = await session.execute(
-            select(Event).where(Event.id == event_id)
-        )
-        event = result.scalar_one_or_none()
+    event = await session.get(Event, event_id)
 
-        if not event:
-            raise HTTPException(status_code=404, detail="Event not found")
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
 
-        await session.delete(event)
-        await session.commit()
+    await session.delete(event)
+    await session.commit()
 
-        return {"success": True, "message": "Event deleted"}
+    return {"success": True, "message": "Event deleted"}
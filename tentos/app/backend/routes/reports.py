@@ -1,7 +1,10 @@
 """Reports and history API routes - pulls from Home Assistant history."""
+import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import Optional
+
+import orjson
 from fastapi import APIRouter, HTTPException, Request, Query
 from fastapi.responses import Response
 
@@ -36,6 +39,15 @@ def downsample_data(data: list, max_points: int = 500) -> list:
     return result
 
 
+def history_to_csv(data: dict[str, list]) -> str:
+    """Render history data (sensor_type -> points) as CSV."""
+    lines = ["timestamp,sensor_type,value"]
+    for sensor_type, points in data.items():
+        for point in points:
+            lines.append(f"{point['timestamp']},{sensor_type},{point['value']}")
+    return "\n".join(lines)
+
+
 def get_entity_ids_for_sensor(tent, sensor_type: str) -> list[str]:
     """Get all entity IDs for a sensor type from tent config."""
     entity_ids = tent.config.sensors.get(sensor_type)
@@ -48,11 +60,7 @@ def get_entity_ids_for_sensor(tent, sensor_type: str) -> list[str]:
 
 def get_light_entity_ids(tent) -> list[str]:
     """Get all light entity IDs from tent expanded slot mapping."""
-    entities = []
-    for slot, entity_id in tent.slot_to_entity.items():
-        if slot == "light" or slot.startswith("light_"):
-            entities.append(entity_id)
-    return entities
+    return list(tent.light_slots.values())
 
 
 def extract_light_periods(history_data: list) -> list[dict]:
@@ -154,7 +162,8 @@ async def get_history(
             ha_history = await ha_client.get_history(
                 list(entity_map.keys()),
                 start_time.isoformat(),
-                end_time.isoformat()
+                end_time.isoformat(),
+                minimal=True
             )
 
             # Process HA history response - it's a list of lists, one per entity
@@ -248,7 +257,8 @@ async def get_history(
             light_history = await ha_client.get_history(
                 light_entities,
                 start_time.isoformat(),
-                end_time.isoformat()
+                end_time.isoformat(),
+                minimal=True
             )
             # Process light history to extract on/off periods
             for entity_history in light_history:
@@ -286,16 +296,15 @@ async def export_data(
         request=request,
         sensors=sensors,
         range=range,
+        from_time=None,
+        to_time=None,
         max_points=10000  # Higher limit for export
     )
 
+    # Exports can run to tens of thousands of points; encode them in a worker
+    # thread so live WebSocket traffic isn't held up meanwhile
     if format == "csv":
-        lines = ["timestamp,sensor_type,value"]
-        for sensor_type, data in history["data"].items():
-            for point in data:
-                lines.append(f"{point['timestamp']},{sensor_type},{point['value']}")
-
-        content = "\n".join(lines)
+        content = await asyncio.to_thread(history_to_csv, history["data"])
         filename = f"{tent_id}_{range}_{datetime.now().strftime('%Y%m%d')}.csv"
 
         return Response(
@@ -304,4 +313,7 @@ async def export_data(
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
     else:
-        return history
+        return Response(
+            content=await asyncio.to_thread(orjson.dumps, history),
+            media_type="application/json"
+        )
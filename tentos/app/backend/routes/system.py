@@ -1,18 +1,29 @@
 """System API routes."""
-import json
 import logging
+from operator import itemgetter
 from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Request
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
 from config import settings, load_tents_config
+from ha_client import HAClient
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def get_connected_ha_client(request: Request) -> HAClient:
+    """Get the HA client from app state, or 503 if it isn't connected."""
+    ha_client = request.app.state.ha_client
+    if not ha_client or not ha_client.connected:
+        raise HTTPException(status_code=503, detail="Not connected to Home Assistant")
+    return ha_client
+
+
 class ConfigUpdate(BaseModel):
     """Request model for config updates."""
     tents: Optional[list] = None
@@ -54,51 +65,66 @@ async def get_status(request: Request):
     }
 
 
+# Entities encoded per streamed chunk in list_entities
+ENTITY_CHUNK_SIZE = 256
+
+
+def iter_entities(states: list[dict], domain: Optional[str], device_class: Optional[str]):
+    """Yield entity summaries for HA states matching the optional filters."""
+    for state in states:
+        entity_id = state.get("entity_id", "")
+        domain_part, sep, _ = entity_id.partition(".")
+        entity_domain = domain_part if sep else ""
+
+        # Filter by domain
+        if domain and entity_domain != domain:
+            continue
+
+        attrs = state.get("attributes", {})
+        entity_device_class = attrs.get("device_class")
+
+        # Filter by device_class
+        if device_class and entity_device_class != device_class:
+            continue
+
+        yield {
+            "entity_id": entity_id,
+            "domain": entity_domain,
+            "device_class": entity_device_class,
+            "friendly_name": attrs.get("friendly_name") or entity_id,
+            "state": state.get("state"),
+            "unit": attrs.get("unit_of_measurement"),
+            "area_id": attrs.get("area_id"),
+            "icon": attrs.get("icon")
+        }
+
+
+def stream_entities_json(entities: list[dict]):
+    """Encode the entity list as {"entities": [...], "count": N} in chunks."""
+    yield b'{"entities":['
+    for start in range(0, len(entities), ENTITY_CHUNK_SIZE):
+        chunk = b",".join(orjson.dumps(e) for e in entities[start:start + ENTITY_CHUNK_SIZE])
+        yield chunk if start == 0 else b"," + chunk
+    yield b'],"count":' + str(len(entities)).encode() + b"}"
+
+
 @router.get("/entities")
 async def list_entities(
-    request: Request,
     domain: Optional[str] = None,
-    device_class: Optional[str] = None
+    device_class: Optional[str] = None,
+    ha_client: HAClient = Depends(get_connected_ha_client)
 ):
     """List available HA entities for mapping."""
-    ha_client = request.app.state.ha_client
-
-    if not ha_client or not ha_client.connected:
-        raise HTTPException(status_code=503, detail="Not connected to Home Assistant")
-
     try:
         states = await ha_client.get_states()
 
-        entities = []
-        for state in states:
-            entity_id = state.get("entity_id", "")
-            entity_domain = entity_id.split(".")[0] if "." in entity_id else ""
-            attrs = state.get("attributes", {})
-            entity_device_class = attrs.get("device_class")
-
-            # Filter by domain
-            if domain and entity_domain != domain:
-                continue
-
-            # Filter by device_class
-            if device_class and entity_device_class != device_class:
-                continue
-
-            entities.append({
-                "entity_id": entity_id,
-                "domain": entity_domain,
-                "device_class": entity_device_class,
-                "friendly_name": attrs.get("friendly_name", entity_id),
-                "state": state.get("state"),
-                "unit": attrs.get("unit_of_measurement"),
-                "area_id": attrs.get("area_id"),
-                "icon": attrs.get("icon")
-            })
-
-        # Sort by domain then name
-        entities.sort(key=lambda x: (x["domain"], x["friendly_name"] or ""))
-
-        return {"entities": entities, "count": len(entities)}
+        # Filter, build and sort by domain then name in a single pass
+        entities = sorted(
+            iter_entities(states, domain, device_class),
+            key=itemgetter("domain", "friendly_name")
+        )
+
+        return StreamingResponse(stream_entities_json(entities), media_type="application/json")
 
     except Exception as e:
         logger.error(f"Failed to list entities: {e}")
@@ -106,13 +132,8 @@ async def list_entities(
 
 
 @router.get("/entity/{entity_id:path}")
-async def get_entity(entity_id: str, request: Request):
+async def get_entity(entity_id: str, ha_client: HAClient = Depends(get_connected_ha_client)):
     """Get details for a specific entity."""
-    ha_client = request.app.state.ha_client
-
-    if not ha_client or not ha_client.connected:
-        raise HTTPException(status_code=503, detail="Not connected to Home Assistant")
-
     try:
         state = await ha_client.get_state(entity_id)
         if not state:
@@ -133,18 +154,21 @@ async def get_entity(entity_id: str, request: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# VPD ranges for reference (generic, no crop-specific advice), encoded once at import
+VPD_CHART_JSON = orjson.dumps({
+    "ranges": [
+        {"min": 0.0, "max": 0.4, "label": "Low", "color": "#3498db"},
+        {"min": 0.4, "max": 0.8, "label": "Early Growth", "color": "#2ecc71"},
+        {"min": 0.8, "max": 1.2, "label": "Optimal", "color": "#27ae60"},
+        {"min": 1.2, "max": 1.6, "label": "Late Growth", "color": "#f1c40f"},
+        {"min": 1.6, "max": 2.5, "label": "High", "color": "#e74c3c"},
+    ],
+    "formula": "VPD = SVP × (1 - RH/100), where SVP = 0.6108 × exp(17.27 × T / (T + 237.3))",
+    "units": "kPa"
+})
+
+
 @router.get("/vpd-chart")
 async def get_vpd_chart_data():
     """Get VPD chart reference data."""
-    # VPD ranges for reference (generic, no crop-specific advice)
-    return {
-        "ranges": [
-            {"min": 0.0, "max": 0.4, "label": "Low", "color": "#3498db"},
-            {"min": 0.4, "max": 0.8, "label": "Early Growth", "color": "#2ecc71"},
-            {"min": 0.8, "max": 1.2, "label": "Optimal", "color": "#27ae60"},
-            {"min": 1.2, "max": 1.6, "label": "Late Growth", "color": "#f1c40f"},
-            {"min": 1.6, "max": 2.5, "label": "High", "color": "#e74c3c"},
-        ],
-        "formula": "VPD = SVP × (1 - RH/100), where SVP = 0.6108 × exp(17.27 × T / (T + 237.3))",
-        "units": "kPa"
-    }
+    return Response(VPD_CHART_JSON, media_type="application/json")
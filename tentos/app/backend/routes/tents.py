@@ -1,4 +1,5 @@
 """Tent API routes."""
+import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import Optional
@@ -8,7 +9,7 @@ from pydantic import BaseModel
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import get_db, SensorHistory, Override, Event
+from database import async_session, get_db, SensorHistory, Override, Event
 from state_manager import StateManager
 
 logger = logging.getLogger(__name__)
@@ -58,6 +59,14 @@ def get_state_manager(request: Request) -> StateManager:
     return request.app.state.state_manager
 
 
+def wake_light_scheduler(request: Request) -> bool:
+    """Have the light scheduler re-evaluate now; returns whether one is running."""
+    light_scheduler = getattr(request.app.state, "light_scheduler", None)
+    if light_scheduler:
+        light_scheduler.wake()
+    return light_scheduler is not None
+
+
 @router.get("")
 async def list_tents(state_manager: StateManager = Depends(get_state_manager)):
     """List all tents with summary status."""
@@ -137,7 +146,7 @@ async def tent_action(
             await ha_client.turn_on(entity_id)
 
             # Log the event
-            async with get_db().__anext__() as session:
+            async with async_session() as session:
                 event = Event(
                     tent_id=tent_id,
                     event_type="watering",
@@ -167,7 +176,7 @@ async def tent_action(
             # "auto" just removes override, handled below
 
             # Store override in database
-            async for session in get_db():
+            async with async_session() as session:
                 # Remove existing override
                 result = await session.execute(
                     select(Override).where(
@@ -192,6 +201,9 @@ async def tent_action(
 
                 await session.commit()
 
+            # The scheduler must start or stop skipping this light now
+            wake_light_scheduler(request)
+
             return {"success": True, "message": f"Override set to {override_state} for {duration} min"}
 
         elif action == "turn_on":
@@ -267,7 +279,8 @@ async def get_tent_history(
     tent_id: str,
     range: str = "24h",  # 24h, 7d, 30d
     sensor: Optional[str] = None,
-    state_manager: StateManager = Depends(get_state_manager)
+    state_manager: StateManager = Depends(get_state_manager),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get sensor history for a tent."""
     tent = state_manager.get_tent(tent_id)
@@ -285,33 +298,35 @@ async def get_tent_history(
     else:
         start_time = now - timedelta(hours=24)
 
-    async for session in get_db():
-        query = select(SensorHistory).where(
-            and_(
-                SensorHistory.tent_id == tent_id,
-                SensorHistory.timestamp >= start_time
-            )
+    # Only indexed columns, so SQLite reads ix_sensor_history_cover alone
+    query = select(
+        SensorHistory.sensor_type, SensorHistory.timestamp, SensorHistory.value
+    ).where(
+        and_(
+            SensorHistory.tent_id == tent_id,
+            SensorHistory.timestamp >= start_time
         )
+    )
 
-        if sensor:
-            query = query.where(SensorHistory.sensor_type == sensor)
+    if sensor:
+        query = query.where(SensorHistory.sensor_type == sensor)
 
-        query = query.order_by(SensorHistory.timestamp)
+    query = query.order_by(SensorHistory.timestamp)
 
-        result = await session.execute(query)
-        records = result.scalars().all()
+    result = await session.execute(query)
+    records = result.all()
 
-        # Group by sensor type
-        history = {}
-        for record in records:
-            if record.sensor_type not in history:
-                history[record.sensor_type] = []
-            history[record.sensor_type].append({
-                "timestamp": record.timestamp.isoformat(),
-                "value": record.value
-            })
+    # Group by sensor type
+    history = {}
+    for record in records:
+        if record.sensor_type not in history:
+            history[record.sensor_type] = []
+        history[record.sensor_type].append({
+            "timestamp": record.timestamp.isoformat(),
+            "value": record.value
+        })
 
-        return {"tent_id": tent_id, "range": range, "history": history}
+    return {"tent_id": tent_id, "range": range, "history": history}
 
 
 @router.put("/{tent_id}/control-settings")
@@ -329,7 +344,7 @@ async def update_control_settings(
     try:
         # Load current config
         from config import load_addon_config, save_addon_config
-        config = load_addon_config()
+        config = await asyncio.to_thread(load_addon_config)
 
         # Find the tent in config
         tent_idx = None
@@ -356,7 +371,7 @@ async def update_control_settings(
             cs["icons"] = settings.icons
 
         # Save config
-        save_addon_config(config)
+        await asyncio.to_thread(save_addon_config, config)
 
         # Reload config in state manager
         await state_manager.reload_config()
@@ -399,7 +414,7 @@ async def update_light_cycle(
 
     try:
         from config import load_addon_config, save_addon_config
-        config = load_addon_config()
+        config = await asyncio.to_thread(load_addon_config)
 
         # Find the tent in config (config uses name, not id)
         tent_idx = None
@@ -431,18 +446,13 @@ async def update_light_cycle(
         elif cycle.mode == "veg":
             growth_stage["flower_start_date"] = None
 
-        save_addon_config(config)
+        await asyncio.to_thread(save_addon_config, config)
         await state_manager.reload_config()
 
-        # Apply immediately so the light snaps to the new schedule
-        applied_now = False
-        light_scheduler = getattr(request.app.state, "light_scheduler", None)
-        if light_scheduler and cycle.enabled:
-            try:
-                await light_scheduler.tick(only_tent_id=tent_id)
-                applied_now = True
-            except Exception as e:
-                logger.warning(f"Immediate light cycle apply failed: {e}")
+        # The woken scheduler applies the new cycle right away and reschedules
+        # around the new on/off times. Ticking here directly would race it
+        # before HA reports the switched state and switch the light twice.
+        applied_now = wake_light_scheduler(request) and cycle.enabled
 
         # Belt-and-suspenders: sync native HA backup automations that flip the
         # lights at the schedule boundaries even if the add-on is stopped.
@@ -453,11 +463,7 @@ async def update_light_cycle(
         warning = None
         try:
             fresh_tent = state_manager.get_tent(tent_id)
-            light_entities = [
-                entity_id
-                for slot, entity_id in (fresh_tent.slot_to_entity if fresh_tent else {}).items()
-                if slot == "light" or slot.startswith("light_")
-            ]
+            light_entities = list(fresh_tent.light_slots.values()) if fresh_tent else []
             await sync_light_cycle_automations(
                 request.app.state.ha_client,
                 tent_id,
@@ -508,7 +514,7 @@ async def flip_to_flower(
 
     try:
         from config import load_addon_config, save_addon_config
-        config = load_addon_config()
+        config = await asyncio.to_thread(load_addon_config)
         ha_client = request.app.state.ha_client
 
         # Find the tent in config
@@ -537,16 +543,13 @@ async def flip_to_flower(
         config["tents"][tent_idx]["schedules"]["photoperiod_off"] = flip_request.light_off_time
 
         # Save config
-        save_addon_config(config)
+        await asyncio.to_thread(save_addon_config, config)
 
         # Create light automation if requested
         automation_id = None
         if flip_request.create_light_automation:
             # Collect ALL light entities (light, light_2, light_3, ...)
-            light_entities = [
-                eid for slot, eid in tent.slot_to_entity.items()
-                if slot == "light" or slot.startswith("light_")
-            ]
+            light_entities = list(tent.light_slots.values())
 
             if light_entities:
                 auto_id = f"tentos_{tent_id}_flower_light"
@@ -636,7 +639,7 @@ async def reset_to_veg(
 
     try:
         from config import load_addon_config, save_addon_config
-        config = load_addon_config()
+        config = await asyncio.to_thread(load_addon_config)
 
         # Find the tent in config
         tent_idx = None
@@ -656,7 +659,7 @@ async def reset_to_veg(
         config["tents"][tent_idx]["growth_stage"]["flower_start_date"] = None
 
         # Save config
-        save_addon_config(config)
+        await asyncio.to_thread(save_addon_config, config)
 
         # Reload config in state manager
         await state_manager.reload_config()
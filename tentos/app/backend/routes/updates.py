@@ -1,6 +1,8 @@
 """Update management API routes."""
+import functools
 import logging
 import os
+import time
 import yaml
 import aiohttp
 from fastapi import APIRouter, HTTPException, Request
@@ -8,6 +10,12 @@ from fastapi import APIRouter, HTTPException, Request
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 # HA Supervisor API
 SUPERVISOR_TOKEN = os.environ.get("SUPERVISOR_TOKEN")
 SUPERVISOR_API = "http://supervisor"
@@ -25,7 +33,6 @@ CHANGELOG_CACHE_TTL = 300  # 5 minutes
 
 async def fetch_recent_commits(limit: int = 15) -> list[dict]:
     """Fetch recent commits from GitHub as changelog entries."""
-    import time
     global _changelog_cache
 
     # Check cache
@@ -110,8 +117,9 @@ async def get_addon_slug():
     return _addon_slug
 
 
+@functools.lru_cache(maxsize=1)
 def get_current_version():
-    """Read version from config.yaml."""
+    """Read version from config.yaml (fixed for the life of the process)."""
     config_paths = [
         "/config.yaml",  # In container
         os.path.join(os.path.dirname(__file__), "../../../config.yaml"),  # Dev
@@ -119,7 +127,7 @@ def get_current_version():
     for path in config_paths:
         try:
             with open(path) as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=YamlLoader)
                 return config.get("version", "unknown")
         except FileNotFoundError:
             continue
@@ -162,7 +170,7 @@ async def check_for_updates():
             async with session.get(config_url) as resp:
                 if resp.status == 200:
                     config_text = await resp.text()
-                    config_data = yaml.safe_load(config_text)
+                    config_data = yaml.load(config_text, Loader=YamlLoader)
                     latest_version = config_data.get("version", "")
 
                     if latest_version:
@@ -419,7 +427,7 @@ async def auto_update():
                 async with session.get(config_url) as resp:
                     if resp.status == 200:
                         config_text = await resp.text()
-                        config_data = yaml.safe_load(config_text)
+                        config_data = yaml.load(config_text, Loader=YamlLoader)
                         latest_version = config_data.get("version", current)
                         update_available = is_newer_version(latest_version, current)
                         logger.info(f"GitHub check: current={current}, latest={latest_version}, update={update_available}")
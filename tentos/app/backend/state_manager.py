@@ -1,27 +1,43 @@
 """State manager for tent monitoring and alerts."""
 import asyncio
-import json
+import functools
 import logging
 import math
 from datetime import datetime, timezone, timedelta
 from typing import Any
 
+import orjson
 from fastapi import WebSocket
-from sqlalchemy import select, and_
+from sqlalchemy import insert, select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import load_tents_config, TentConfig
-from database import async_session, Alert, Event, SensorHistory, Override
+from database import async_session, prune_sensor_history, Alert, Event, SensorHistory, Override
 from ha_client import HAClient
 
 logger = logging.getLogger(__name__)
 
+# Longest history range the API serves is 30d; older samples are pruned daily
+HISTORY_RETENTION_DAYS = 30
+HISTORY_PRUNE_INTERVAL = 24 * 3600
+
+# HA state changes are applied, and tents broadcast, at most once per window;
+# a noisy entity only has its latest state applied
+BROADCAST_COALESCE_SECONDS = 0.05
+
+# Outbound messages held per WebSocket client; a client that falls this far
+# behind is disconnected and reloads its state on reconnect
+WS_QUEUE_SIZE = 1000
+
 
 def fahrenheit_to_celsius(f: float) -> float:
     """Convert Fahrenheit to Celsius."""
     return (f - 32) * 5 / 9
 
 
+# Readings are rounded to 0.1 before they get here, so the input space is
+# small and repeated (temp, humidity) pairs are common between updates
+@functools.lru_cache(maxsize=4096)
 def calculate_vpd(temp: float, humidity: float) -> float:
     """
     Calculate Vapor Pressure Deficit (VPD) in kPa.
@@ -144,6 +160,51 @@ def infer_growth_stage(schedules: dict, growth_stage_config: dict = None) -> dic
     return result
 
 
+class EnvironmentScorer:
+    """Environment score ranges for a single tent, resolved once from its targets.
+
+    Each reading's distance outside its range is max(0, lo - v, v - hi), which
+    is 0 in range, so scoring is one expression per reading with no branching
+    on which side of the range it fell.
+    """
+
+    __slots__ = ("temp_min", "temp_max", "humidity_min", "humidity_max")
+
+    def __init__(self, targets: dict):
+        self.temp_min = targets.get("temp_day_min", 18)
+        self.temp_max = targets.get("temp_day_max", 28)
+        self.humidity_min = targets.get("humidity_day_min", 40)
+        self.humidity_max = targets.get("humidity_day_max", 70)
+
+    def score(self, temp: float | None, humidity: float | None, vpd: float | None) -> int:
+        """Score (0-100) for the given readings; None readings are skipped."""
+        scores = []
+
+        # Temperature: lose 10 points per degree out of range
+        if temp is not None:
+            deviation = max(0, self.temp_min - temp, temp - self.temp_max)
+            scores.append(max(0, 100 - deviation * 10))
+
+        # Humidity: lose 2 points per percent out of range
+        if humidity is not None:
+            deviation = max(0, self.humidity_min - humidity, humidity - self.humidity_max)
+            scores.append(max(0, 100 - deviation * 2))
+
+        # VPD score (ideal range 0.8-1.2 kPa for most plants)
+        if vpd is not None:
+            if 0.8 <= vpd <= 1.2:
+                scores.append(100)
+            elif 0.4 <= vpd <= 1.6:
+                scores.append(75)
+            else:
+                scores.append(50)
+
+        if not scores:
+            return 0
+
+        return int(sum(scores) / len(scores))
+
+
 def calculate_environment_score(tent_state: dict, targets: dict) -> int:
     """
     Calculate environment score (0-100) based on how well readings match targets.
@@ -155,52 +216,107 @@ def calculate_environment_score(tent_state: dict, targets: dict) -> int:
     Returns:
         Score from 0-100
     """
-    scores = []
-
-    # Temperature score
-    temp = tent_state.get("temperature")
-    if temp is not None:
-        temp_min = targets.get("temp_day_min", 18)
-        temp_max = targets.get("temp_day_max", 28)
-        if temp_min <= temp <= temp_max:
-            scores.append(100)
-        else:
-            # Calculate how far out of range
-            if temp < temp_min:
-                deviation = temp_min - temp
-            else:
-                deviation = temp - temp_max
-            # Lose 10 points per degree out of range
-            scores.append(max(0, 100 - deviation * 10))
+    return EnvironmentScorer(targets).score(
+        tent_state.get("temperature"), tent_state.get("humidity"), tent_state.get("vpd")
+    )
 
-    # Humidity score
-    humidity = tent_state.get("humidity")
-    if humidity is not None:
-        hum_min = targets.get("humidity_day_min", 40)
-        hum_max = targets.get("humidity_day_max", 70)
-        if hum_min <= humidity <= hum_max:
-            scores.append(100)
-        else:
-            if humidity < hum_min:
-                deviation = hum_min - humidity
-            else:
-                deviation = humidity - hum_max
-            scores.append(max(0, 100 - deviation * 2))
 
-    # VPD score (ideal range 0.8-1.2 kPa for most plants)
-    vpd = tent_state.get("vpd")
-    if vpd is not None:
-        if 0.8 <= vpd <= 1.2:
-            scores.append(100)
-        elif 0.4 <= vpd <= 1.6:
-            scores.append(75)
-        else:
-            scores.append(50)
+# Alerts with no reading-dependent fields are shared rather than rebuilt
+LEAK_ALERT = {
+    "type": "leak_detected",
+    "severity": "critical",
+    "message": "Water leak detected!"
+}
+LEAK_STATES = frozenset(["on", "wet", "detected", True])
+
 
-    if not scores:
-        return 0
+class AlertChecker:
+    """Alert thresholds for a single tent, resolved once from its config.
+
+    A checker is built with each TentState, so the periodic alert scan only
+    compares live readings against precomputed limits instead of re-reading
+    targets with defaults for every tent on every tick. The enabled range
+    checks are compiled into a rule table that a single loop walks, and
+    out-of-range alerts are reused while the displayed reading stays the same.
+    """
+
+    __slots__ = (
+        "enabled", "temp_enabled", "humidity_enabled", "leak_enabled", "reservoir_enabled",
+        "temp_min", "temp_max", "humidity_min", "humidity_max",
+        "_range_rules", "_range_alerts",
+    )
+
+    def __init__(self, targets: dict, notifications: dict):
+        self.enabled = notifications.get("enabled", True)
+        self.temp_enabled = notifications.get("alert_temp_out_of_range", True)
+        self.humidity_enabled = notifications.get("alert_humidity_out_of_range", True)
+        self.leak_enabled = notifications.get("alert_leak_detected", True)
+        self.reservoir_enabled = notifications.get("alert_reservoir_low", True)
+        self.temp_min = targets.get("temp_day_min", 18)
+        self.temp_max = targets.get("temp_day_max", 30)
+        self.humidity_min = targets.get("humidity_day_min", 40)
+        self.humidity_max = targets.get("humidity_day_max", 70)
+
+        # (sensor slot, alert type, min, max, message template, extra alert fields)
+        rules = []
+        if self.temp_enabled:
+            # Temperature values are stored in Celsius
+            rules.append((
+                "temperature", "temp_out_of_range", self.temp_min, self.temp_max,
+                f"Temperature {{}}°C is outside range ({self.temp_min}-{self.temp_max}°C)",
+                {"unit": "C"},
+            ))
+        if self.humidity_enabled:
+            rules.append((
+                "humidity", "humidity_out_of_range", self.humidity_min, self.humidity_max,
+                f"Humidity {{}}% is outside range ({self.humidity_min}-{self.humidity_max}%)",
+                {},
+            ))
+        self._range_rules = tuple(rules)
+        self._range_alerts: dict[str, dict] = {}
+
+    def check(self, sensors: dict) -> list[dict]:
+        """Return the alerts raised by the current sensor readings."""
+        alerts = []
+
+        # Temperature and humidity range alerts
+        for slot, alert_type, lo, hi, template, extra in self._range_rules:
+            value = sensors.get(slot, {}).get("value")
+            if value is None or lo <= value <= hi:
+                continue
+            # Round to 1 decimal for display
+            display = round(value, 1)
+            alert = self._range_alerts.get(alert_type)
+            if alert is None or alert["value"] != display:
+                alert = self._range_alerts[alert_type] = {
+                    "type": alert_type,
+                    "severity": "warning",
+                    "message": template.format(display),
+                    "value": display,
+                    **extra,
+                    "range_min": lo,
+                    "range_max": hi
+                }
+            alerts.append(alert)
+
+        # Leak sensor alert
+        if self.leak_enabled and sensors.get("leak_sensor", {}).get("value") in LEAK_STATES:
+            alerts.append(LEAK_ALERT)
+
+        # Reservoir low alert
+        reservoir = sensors.get("reservoir_level", {}).get("value")
+        if reservoir is not None and self.reservoir_enabled:
+            try:
+                if float(reservoir) < 20:
+                    alerts.append({
+                        "type": "reservoir_low",
+                        "severity": "warning",
+                        "message": f"Reservoir level low ({reservoir}%)"
+                    })
+            except (ValueError, TypeError):
+                pass
 
-    return int(sum(scores) / len(scores))
+        return alerts
 
 
 class TentState:
@@ -208,19 +324,42 @@ class TentState:
 
     def __init__(self, config: TentConfig):
         self.config = config
+        # Bumped on every change; keys the cached JSON encoding
+        self.version = 0
+        self._json_cache: tuple[int, bytes] | None = None
+        self._debug_cache: tuple[int, dict] | None = None
         self.sensors: dict[str, Any] = {}
         self.actuators: dict[str, Any] = {}
         self.slot_to_entity: dict[str, str] = {}
+        self.light_slots: dict[str, str] = {}  # light slot -> entity_id, subset of slot_to_entity
         self.vpd: float | None = None
         self.avg_temperature: float | None = None
         self.avg_humidity: float | None = None
         self.environment_score: int = 0
-        self.alerts: list[dict] = []
+        self.alerts: list[dict] = []  # also sets severity_counts
         self.last_updated: datetime | None = None
         self.growth_stage: dict = {}
+        self.alert_checker = AlertChecker(config.targets, config.notifications)
+        self.environment_scorer = EnvironmentScorer(config.targets)
         self._build_actuator_slots()
         self._update_growth_stage()
 
+    @property
+    def alerts(self) -> list[dict]:
+        """Active alerts from the last alert check."""
+        return self._alerts
+
+    @alerts.setter
+    def alerts(self, alerts: list[dict]):
+        # Count per severity on write so summaries don't rescan every alert
+        self._alerts = alerts
+        self.version += 1
+        counts: dict[str, int] = {}
+        for alert in alerts:
+            severity = alert.get("severity", "warning")
+            counts[severity] = counts.get(severity, 0) + 1
+        self.severity_counts = counts
+
     def _build_actuator_slots(self):
         """Expand multi-entity actuator arrays into numbered slots.
 
@@ -237,17 +376,27 @@ class TentState:
             elif entity_ids:
                 self.slot_to_entity[actuator_type] = entity_ids
 
+        # Index light slots once so the light scheduler doesn't rescan every slot
+        self.light_slots = {
+            slot: entity_id
+            for slot, entity_id in self.slot_to_entity.items()
+            if slot == "light" or slot.startswith("light_")
+        }
+
     def _update_growth_stage(self):
         """Update growth stage info from config and schedules."""
         growth_stage_config = getattr(self.config, 'growth_stage', None) or {}
         self.growth_stage = infer_growth_stage(self.config.schedules, growth_stage_config)
+        self.version += 1
 
     def update_sensor(self, sensor_type: str, value: Any, unit: str | None = None, entity_id: str | None = None):
         """Update a sensor value. For multi-entity slots, averages all values.
 
         Temperature values are normalized to Celsius for consistent storage and VPD calculation.
         """
-        now = datetime.now(timezone.utc).isoformat()
+        # One clock read per update, shared with last_updated in _recalculate
+        now_dt = datetime.now(timezone.utc)
+        now = now_dt.isoformat()
 
         # Normalize temperature to Celsius
         if sensor_type == "temperature" and value is not None:
@@ -283,7 +432,7 @@ class TentState:
                 "updated": now,
                 "_entities": {entity_id: value} if entity_id else {}
             }
-        self._recalculate()
+        self._recalculate(now_dt)
 
     def update_actuator(self, actuator_type: str, state: str, attributes: dict | None = None):
         """Update an actuator state."""
@@ -292,6 +441,7 @@ class TentState:
             "attributes": attributes or {},
             "updated": datetime.now(timezone.utc).isoformat()
         }
+        self.version += 1
 
     def _get_averaged_value(self, sensor_type: str) -> float | None:
         """Get averaged value for sensors (handles arrays of entities)."""
@@ -316,9 +466,10 @@ class TentState:
             return round(sum(values) / len(values), 1)
         return None
 
-    def _recalculate(self):
+    def _recalculate(self, now: datetime | None = None):
         """Recalculate derived values."""
-        self.last_updated = datetime.now(timezone.utc)
+        self.version += 1
+        self.last_updated = now or datetime.now(timezone.utc)
 
         # Get averaged temp and humidity from multiple sensors
         avg_temp = self._get_averaged_value("temperature")
@@ -333,11 +484,7 @@ class TentState:
             self.vpd = calculate_vpd(avg_temp, avg_humidity)
 
         # Calculate environment score using averaged values
-        sensor_values = {k: v.get("value") for k, v in self.sensors.items()}
-        sensor_values["temperature"] = avg_temp  # Use averaged temp
-        sensor_values["humidity"] = avg_humidity  # Use averaged humidity
-        sensor_values["vpd"] = self.vpd
-        self.environment_score = calculate_environment_score(sensor_values, self.config.targets)
+        self.environment_score = self.environment_scorer.score(avg_temp, avg_humidity, self.vpd)
 
     def to_dict(self) -> dict:
         """Convert to dictionary for API response."""
@@ -359,6 +506,26 @@ class TentState:
             "control_settings": getattr(self.config, 'control_settings', None) or {}
         }
 
+    def to_json(self) -> bytes:
+        """to_dict() encoded with orjson, reused until the tent next changes."""
+        if self._json_cache is None or self._json_cache[0] != self.version:
+            self._json_cache = (self.version, orjson.dumps(self.to_dict()))
+        return self._json_cache[1]
+
+    def to_debug_dict(self) -> dict:
+        """Summary for the climate debug page, reused until the tent next changes."""
+        if self._debug_cache is None or self._debug_cache[0] != self.version:
+            self._debug_cache = (self.version, {
+                "id": self.config.id,
+                "name": self.config.name,
+                "avg_temperature": self.avg_temperature,
+                "avg_humidity": self.avg_humidity,
+                "vpd": self.vpd,
+                "sensors": {k: str(v) for k, v in self.sensors.items()},
+                "actuators": {k: str(v) for k, v in self.actuators.items()},
+            })
+        return self._debug_cache[1]
+
 
 class StateManager:
     """Manages state for all tents and handles alerts."""
@@ -366,12 +533,25 @@ class StateManager:
     def __init__(self, ha_client: HAClient, automation_engine=None):
         self.ha_client = ha_client
         self.automation_engine = automation_engine
+        # Set by the app once created; woken when a light or the config changes
+        self.light_scheduler = None
         self.tents: dict[str, TentState] = {}
         self.entity_to_tent: dict[str, tuple[str, str, str]] = {}  # entity_id -> (tent_id, category, type)
-        self.ws_clients: list[WebSocket] = []
+        self.ws_clients: set[WebSocket] = set()
+        self.ws_queues: dict[WebSocket, asyncio.Queue] = {}
         self._running = False
         self._alert_check_task: asyncio.Task | None = None
         self._history_task: asyncio.Task | None = None
+        self._prune_task: asyncio.Task | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._dirty_tents: set[str] = set()
+        # entity_id -> latest HA state not yet applied to its tent
+        self._pending_states: dict[str, dict] = {}
+        self._dirty = asyncio.Event()
+        # Encoded initial_state frame, reset whenever any tent changes
+        self._initial_state_bytes: bytes | None = None
+        # Close tasks for evicted slow clients, referenced until done
+        self._closing: set[asyncio.Task] = set()
 
     def _load_config(self):
         """Load tent configurations and build entity mappings."""
@@ -403,6 +583,7 @@ class StateManager:
         # Clear existing mappings
         self.tents.clear()
         self.entity_to_tent.clear()
+        self._initial_state_bytes = None
 
         # Reload from file
         self._load_config()
@@ -414,6 +595,9 @@ class StateManager:
         for tent_id in self.tents:
             await self._broadcast_update(tent_id)
 
+        # Light cycles or light entities may have changed
+        self._wake_light_scheduler()
+
         logger.info(f"Reloaded {len(self.tents)} tents")
 
     async def start(self):
@@ -422,7 +606,7 @@ class StateManager:
         self._load_config()
 
         # Subscribe to HA state changes
-        await self.ha_client.subscribe_state_changes(self._on_state_change)
+        await self.ha_client.subscribe_state_changes(self._on_state_change, self.entity_to_tent)
 
         # Load initial states
         await self._load_initial_states()
@@ -430,6 +614,8 @@ class StateManager:
         # Start background tasks
         self._alert_check_task = asyncio.create_task(self._alert_check_loop())
         self._history_task = asyncio.create_task(self._history_record_loop())
+        self._prune_task = asyncio.create_task(self._history_prune_loop())
+        self._flush_task = asyncio.create_task(self._broadcast_flush_loop())
 
     async def stop(self):
         """Stop the state manager."""
@@ -438,15 +624,17 @@ class StateManager:
             self._alert_check_task.cancel()
         if self._history_task:
             self._history_task.cancel()
+        if self._prune_task:
+            self._prune_task.cancel()
+        if self._flush_task:
+            self._flush_task.cancel()
 
     async def _load_initial_states(self):
         """Load initial states for all mapped entities."""
-        states = await self.ha_client.get_states()
+        states = await self.ha_client.get_states_for(list(self.entity_to_tent))
 
         for state in states:
-            entity_id = state.get("entity_id")
-            if entity_id in self.entity_to_tent:
-                await self._process_state_update(entity_id, state)
+            await self._process_state_update(state["entity_id"], state)
 
         logger.info("Loaded initial states")
 
@@ -456,7 +644,8 @@ class StateManager:
         new_state = event_data.get("new_state")
 
         if entity_id in self.entity_to_tent and new_state:
-            await self._process_state_update(entity_id, new_state)
+            self._pending_states[entity_id] = new_state
+            self._dirty.set()
 
     async def _process_state_update(self, entity_id: str, state: dict):
         """Process a state update for a mapped entity."""
@@ -465,6 +654,7 @@ class StateManager:
 
         if not tent:
             return
+        self._initial_state_bytes = None
 
         state_value = state.get("state")
         attributes = state.get("attributes", {})
@@ -494,41 +684,102 @@ class StateManager:
                     logger.error(f"Automation rule evaluation error: {e}")
 
         elif category == "actuator":
+            previous = (tent.actuators.get(item_type) or {}).get("state")
             tent.update_actuator(item_type, state_value, attributes)
+            # Re-check the light cycle as soon as a light changes state
+            if item_type in tent.light_slots and state_value != previous:
+                self._wake_light_scheduler()
 
         # Broadcast update to WebSocket clients
-        await self._broadcast_update(tent_id)
+        self._mark_dirty(tent_id)
+
+    def _wake_light_scheduler(self):
+        """Have the light scheduler re-evaluate now, if one is attached."""
+        if self.light_scheduler:
+            self.light_scheduler.wake()
+
+    def _mark_dirty(self, tent_id: str):
+        """Schedule a coalesced tent_update broadcast for a tent."""
+        if not self.ws_queues:
+            return
+        self._dirty_tents.add(tent_id)
+        self._dirty.set()
+
+    async def _broadcast_flush_loop(self):
+        """Apply pending HA states and serialize each dirty tent once per window."""
+        while self._running:
+            try:
+                await self._dirty.wait()
+                await asyncio.sleep(BROADCAST_COALESCE_SECONDS)
+                # Clear before taking the batches: anything that arrives while
+                # we await below sets the event again and gets its own pass
+                self._dirty.clear()
+                pending, self._pending_states = self._pending_states, {}
+                for entity_id, state in pending.items():
+                    # The mapping may have been reloaded since the event arrived
+                    if entity_id in self.entity_to_tent:
+                        await self._process_state_update(entity_id, state)
+                dirty, self._dirty_tents = self._dirty_tents, set()
+                for tent_id in dirty:
+                    await self._broadcast_update(tent_id)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Broadcast flush error: {e}")
 
     async def _broadcast_update(self, tent_id: str):
         """Broadcast tent update to all WebSocket clients."""
         tent = self.tents.get(tent_id)
-        if not tent:
+        if not tent or not self.ws_queues:
             return
 
-        message = json.dumps({
+        self.broadcast(orjson.dumps({
             "type": "tent_update",
             "tent_id": tent_id,
-            "data": tent.to_dict()
-        })
-
-        disconnected = []
-        for ws in self.ws_clients:
-            try:
-                await ws.send_text(message)
-            except Exception:
-                disconnected.append(ws)
+            "data": orjson.Fragment(tent.to_json())
+        }))
 
-        for ws in disconnected:
-            self.ws_clients.remove(ws)
+    def broadcast(self, message: bytes):
+        """Queue one encoded message for every WebSocket client.
 
-    def add_websocket_client(self, ws: WebSocket):
-        """Add a WebSocket client."""
-        self.ws_clients.append(ws)
+        The message is encoded once by the caller and the same bytes are
+        shared by all clients. Each client's sender task drains its queue and
+        batches frames; a client whose queue is full is disconnected rather
+        than left to silently miss messages.
+        """
+        slow = []
+        for ws, queue in self.ws_queues.items():
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                slow.append(ws)
+
+        for ws in slow:
+            logger.warning("WebSocket client queue full, disconnecting slow client")
+            self.remove_websocket_client(ws)
+            task = asyncio.create_task(self._close_websocket(ws))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_websocket(ws: WebSocket):
+        """Close an evicted client's socket; it may already be gone."""
+        try:
+            await ws.close(code=1013)
+        except Exception:
+            pass
+
+    def add_websocket_client(self, ws: WebSocket) -> asyncio.Queue:
+        """Add a WebSocket client and return its outbound message queue."""
+        self.ws_clients.add(ws)
+        queue = asyncio.Queue(maxsize=WS_QUEUE_SIZE)
+        self.ws_queues[ws] = queue
+        return queue
 
     def remove_websocket_client(self, ws: WebSocket):
         """Remove a WebSocket client."""
-        if ws in self.ws_clients:
-            self.ws_clients.remove(ws)
+        self.ws_clients.discard(ws)
+        self.ws_queues.pop(ws, None)
 
     async def _alert_check_loop(self):
         """Periodically check for alert conditions."""
@@ -544,77 +795,12 @@ class StateManager:
 
     async def _check_alerts(self):
         """Check all tents for alert conditions."""
-        async with async_session() as session:
-            for tent_id, tent in self.tents.items():
-                alerts = []
-                targets = tent.config.targets
-                notifications = tent.config.notifications
-
-                if not notifications.get("enabled", True):
-                    continue
-
-                # Temperature alert (values stored in Celsius)
-                temp_data = tent.sensors.get("temperature", {})
-                temp = temp_data.get("value")
-                if temp is not None and notifications.get("alert_temp_out_of_range", True):
-                    temp_min = targets.get("temp_day_min", 18)
-                    temp_max = targets.get("temp_day_max", 30)
-                    if temp < temp_min or temp > temp_max:
-                        # Round to 1 decimal for display
-                        temp_display = round(temp, 1)
-                        alerts.append({
-                            "type": "temp_out_of_range",
-                            "severity": "warning",
-                            "message": f"Temperature {temp_display}°C is outside range ({temp_min}-{temp_max}°C)",
-                            "value": temp_display,
-                            "unit": "C",
-                            "range_min": temp_min,
-                            "range_max": temp_max
-                        })
-
-                # Humidity alert
-                hum_data = tent.sensors.get("humidity", {})
-                humidity = hum_data.get("value")
-                if humidity is not None and notifications.get("alert_humidity_out_of_range", True):
-                    hum_min = targets.get("humidity_day_min", 40)
-                    hum_max = targets.get("humidity_day_max", 70)
-                    if humidity < hum_min or humidity > hum_max:
-                        # Round to 1 decimal for display
-                        hum_display = round(humidity, 1)
-                        alerts.append({
-                            "type": "humidity_out_of_range",
-                            "severity": "warning",
-                            "message": f"Humidity {hum_display}% is outside range ({hum_min}-{hum_max}%)",
-                            "value": hum_display,
-                            "range_min": hum_min,
-                            "range_max": hum_max
-                        })
-
-                # Leak sensor alert
-                leak_data = tent.sensors.get("leak_sensor", {})
-                if leak_data.get("value") in ["on", "wet", "detected", True]:
-                    if notifications.get("alert_leak_detected", True):
-                        alerts.append({
-                            "type": "leak_detected",
-                            "severity": "critical",
-                            "message": "Water leak detected!"
-                        })
-
-                # Reservoir low alert
-                reservoir_data = tent.sensors.get("reservoir_level", {})
-                reservoir = reservoir_data.get("value")
-                if reservoir is not None and notifications.get("alert_reservoir_low", True):
-                    try:
-                        if float(reservoir) < 20:
-                            alerts.append({
-                                "type": "reservoir_low",
-                                "severity": "warning",
-                                "message": f"Reservoir level low ({reservoir}%)"
-                            })
-                    except (ValueError, TypeError):
-                        pass
-
-                tent.alerts = alerts
+        for tent in self.tents.values():
+            checker = tent.alert_checker
+            if not checker.enabled:
+                continue
+            tent.alerts = checker.check(tent.sensors)
+        self._initial_state_bytes = None
 
     async def _history_record_loop(self):
         """Periodically record sensor history."""
@@ -628,33 +814,50 @@ class StateManager:
                 logger.error(f"History record error: {e}")
                 await asyncio.sleep(300)
 
+    async def _history_prune_loop(self):
+        """Periodically drop sensor history older than the retention window."""
+        while self._running:
+            try:
+                removed = await prune_sensor_history(HISTORY_RETENTION_DAYS)
+                if removed:
+                    logger.info(f"Pruned {removed} sensor history rows")
+                await asyncio.sleep(HISTORY_PRUNE_INTERVAL)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"History prune error: {e}")
+                await asyncio.sleep(HISTORY_PRUNE_INTERVAL)
+
     async def _record_history(self):
         """Record current sensor values to history."""
-        async with async_session() as session:
-            for tent_id, tent in self.tents.items():
-                for sensor_type, sensor_data in tent.sensors.items():
-                    value = sensor_data.get("value")
-                    if value is not None:
-                        try:
-                            numeric_value = float(value)
-                            record = SensorHistory(
-                                tent_id=tent_id,
-                                sensor_type=sensor_type,
-                                value=numeric_value
-                            )
-                            session.add(record)
-                        except (ValueError, TypeError):
-                            pass
-
-                # Also record VPD
-                if tent.vpd is not None:
-                    record = SensorHistory(
-                        tent_id=tent_id,
-                        sensor_type="vpd",
-                        value=tent.vpd
-                    )
-                    session.add(record)
+        rows = []
+        for tent_id, tent in self.tents.items():
+            for sensor_type, sensor_data in tent.sensors.items():
+                value = sensor_data.get("value")
+                if value is not None:
+                    try:
+                        rows.append({
+                            "tent_id": tent_id,
+                            "sensor_type": sensor_type,
+                            "value": float(value)
+                        })
+                    except (ValueError, TypeError):
+                        pass
+
+            # Also record VPD
+            if tent.vpd is not None:
+                rows.append({
+                    "tent_id": tent_id,
+                    "sensor_type": "vpd",
+                    "value": tent.vpd
+                })
+
+        if not rows:
+            return
 
+        # One executemany INSERT instead of a unit-of-work flush per row
+        async with async_session() as session:
+            await session.execute(insert(SensorHistory), rows)
             await session.commit()
 
     def get_tent(self, tent_id: str) -> TentState | None:
@@ -664,3 +867,16 @@ class StateManager:
     def get_all_tents(self) -> list[dict]:
         """Get all tent states."""
         return [tent.to_dict() for tent in self.tents.values()]
+
+    def get_initial_state_bytes(self) -> bytes:
+        """Encoded initial_state frame for a new WebSocket client.
+
+        Cached until the next tent change, so a burst of reconnecting
+        dashboards shares a single serialization.
+        """
+        if self._initial_state_bytes is None:
+            self._initial_state_bytes = orjson.dumps({
+                "type": "initial_state",
+                "tents": [orjson.Fragment(tent.to_json()) for tent in self.tents.values()]
+            })
+        return self._initial_state_bytes
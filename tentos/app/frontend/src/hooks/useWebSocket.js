@@ -1,6 +1,10 @@
 import { useState, useEffect, useCallback, useRef } from 'react'
+import { flushSync } from 'react-dom'
 import { getWsUrl } from '../utils/api'
 
+// Every server frame (broadcasts, batches and replies) is binary UTF-8 JSON
+const textDecoder = new TextDecoder()
+
 export function useWebSocket(url) {
   const [lastMessage, setLastMessage] = useState(null)
   const [readyState, setReadyState] = useState(WebSocket.CONNECTING)
@@ -14,6 +18,7 @@ export function useWebSocket(url) {
       console.log('WebSocket connecting to:', wsUrl)
 
       wsRef.current = new WebSocket(wsUrl)
+      wsRef.current.binaryType = 'arraybuffer'
 
       wsRef.current.onopen = () => {
         setReadyState(WebSocket.OPEN)
@@ -22,8 +27,14 @@ export function useWebSocket(url) {
 
       wsRef.current.onmessage = (event) => {
         try {
-          const data = JSON.parse(event.data)
-          setLastMessage(data)
+          const text = typeof event.data === 'string' ? event.data : textDecoder.decode(event.data)
+          const data = JSON.parse(text)
+          if (Array.isArray(data)) {
+            // Batched frame - render each message so no update is coalesced away
+            data.forEach(msg => flushSync(() => setLastMessage(msg)))
+          } else {
+            setLastMessage(data)
+          }
         } catch (e) {
           console.error('Failed to parse WebSocket message', e)
         }
@@ -1,5 +1,9 @@
 """Tests for alert logic."""
 import pytest
+import sys
+sys.path.insert(0, '../backend')
+
+from state_manager import AlertChecker as TentAlertChecker
 
 
 class AlertChecker:
@@ -202,3 +206,61 @@ class TestReservoirAlerts:
         alert = self.checker.check_reservoir(5)
         assert alert is not None
         assert alert["severity"] == "critical"
+
+
+class TestTentAlertChecker:
+    """Test the StateManager's per-tent alert checker."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.targets = {
+            "temp_day_min": 22,
+            "temp_day_max": 28,
+            "humidity_day_min": 50,
+            "humidity_day_max": 70
+        }
+
+    def sensors(self, **values):
+        return {k: {"value": v} for k, v in values.items()}
+
+    def test_no_alerts_in_range(self):
+        checker = TentAlertChecker(self.targets, {})
+        assert checker.check(self.sensors(temperature=25, humidity=60)) == []
+
+    def test_defaults_when_targets_missing(self):
+        checker = TentAlertChecker({}, {})
+        assert (checker.temp_min, checker.temp_max) == (18, 30)
+        assert (checker.humidity_min, checker.humidity_max) == (40, 70)
+
+    def test_out_of_range_alerts(self):
+        checker = TentAlertChecker(self.targets, {})
+        alerts = checker.check(self.sensors(temperature=30.04, humidity=45))
+        assert [a["type"] for a in alerts] == ["temp_out_of_range", "humidity_out_of_range"]
+        assert alerts[0]["value"] == 30.0
+        assert alerts[0]["message"] == "Temperature 30.0°C is outside range (22-28°C)"
+        assert alerts[1]["range_min"] == 50
+
+    def test_unchanged_reading_reuses_alert(self):
+        checker = TentAlertChecker(self.targets, {})
+        first = checker.check(self.sensors(temperature=31.0))[0]
+        assert checker.check(self.sensors(temperature=31.02))[0] is first
+        changed = checker.check(self.sensors(temperature=31.5))[0]
+        assert changed["message"] == "Temperature 31.5°C is outside range (22-28°C)"
+
+    def test_leak_and_reservoir(self):
+        checker = TentAlertChecker({}, {})
+        alerts = checker.check(self.sensors(leak_sensor="wet", reservoir_level="10"))
+        assert [a["type"] for a in alerts] == ["leak_detected", "reservoir_low"]
+        assert alerts[0]["severity"] == "critical"
+
+    def test_individual_alerts_disabled(self):
+        checker = TentAlertChecker(self.targets, {
+            "alert_temp_out_of_range": False,
+            "alert_leak_detected": False
+        })
+        alerts = checker.check(self.sensors(temperature=40, leak_sensor="on"))
+        assert alerts == []
+
+    def test_notifications_disabled(self):
+        checker = TentAlertChecker(self.targets, {"enabled": False})
+        assert checker.enabled is False
@@ -0,0 +1,47 @@
+"""Tests for event pagination cursors."""
+import pytest
+import sys
+sys.path.insert(0, '../backend')
+
+from database import Event
+from routes.events import format_event_cursor, format_event_time, parse_event_cursor
+
+# 2023-11-14T22:13:20.000Z
+BASE_MS = 1700000000000
+
+
+class TestEventCursor:
+    """Test encoding and decoding of (timestamp, id) keyset cursors."""
+
+    def test_round_trip(self):
+        event = Event(id=42, timestamp=BASE_MS + 123)
+        cursor = format_event_cursor(event)
+        assert cursor == "2023-11-14T22:13:20.123Z_42"
+        assert parse_event_cursor(cursor) == (BASE_MS + 123, 42)
+
+    def test_same_millisecond_tie_broken_by_id(self):
+        first = parse_event_cursor(format_event_cursor(Event(id=7, timestamp=BASE_MS)))
+        second = parse_event_cursor(format_event_cursor(Event(id=8, timestamp=BASE_MS)))
+        assert first[0] == second[0]
+        assert first < second
+
+    def test_bare_iso_timestamp(self):
+        assert parse_event_cursor(format_event_time(BASE_MS)) == (BASE_MS, None)
+        assert parse_event_cursor("2023-11-14T22:13:20+00:00") == (BASE_MS, None)
+
+    def test_naive_iso_is_utc(self):
+        assert parse_event_cursor("2023-11-14T22:13:20") == (BASE_MS, None)
+
+    def test_epoch_milliseconds(self):
+        assert parse_event_cursor(str(BASE_MS)) == (BASE_MS, None)
+        assert parse_event_cursor(f"{BASE_MS}_5") == (BASE_MS, 5)
+
+    def test_bad_ids_raise(self):
+        for bad in [f"{BASE_MS}_", f"{BASE_MS}_abc", f"{BASE_MS}_-1", "2023-11-14T22:13:20Z_1.5"]:
+            with pytest.raises(ValueError):
+                parse_event_cursor(bad)
+
+    def test_bad_timestamps_raise(self):
+        for bad in ["", "yesterday", "abc_1"]:
+            with pytest.raises(ValueError):
+                parse_event_cursor(bad)
@@ -1,19 +1,27 @@
 """Tests for the light cycle scheduler helpers."""
+import asyncio
 import pytest
 import sys
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 sys.path.insert(0, '../backend')
 
 from light_scheduler import (
     LIGHT_CYCLE_AUTOMATION_DESCRIPTION,
     PHOTOPERIOD_BOUNDS,
     PHOTOPERIOD_PRESETS,
+    RESYNC_INTERVAL_SECONDS,
+    RETRY_INTERVAL_SECONDS,
+    LightScheduler,
     build_light_cycle_automations,
     compute_off_time,
     desired_light_state,
     duration_hours_from_times,
     format_hhmm,
     light_cycle_automation_ids,
+    light_cycle_boundaries,
     parse_hhmm,
+    seconds_until_next_boundary,
     validate_light_cycle,
 )
 
@@ -206,3 +214,110 @@ class TestDesiredState:
         # On 06:00 for 12.5h -> off at 18:30
         assert desired_light_state(18 * 60 + 29, "06:00", 12.5) is True
         assert desired_light_state(18 * 60 + 30, "06:00", 12.5) is False
+
+
+class TestNextBoundary:
+    """Test the on/off boundaries the scheduler sleeps until."""
+
+    def test_boundaries(self):
+        assert light_cycle_boundaries("06:00", 18) == (360, 0)
+        assert light_cycle_boundaries("20:00", 12) == (20 * 60, 8 * 60)
+
+    def test_no_boundaries_when_always_on_or_off(self):
+        assert light_cycle_boundaries("06:00", 24) == ()
+        assert light_cycle_boundaries("06:00", 0) == ()
+        assert seconds_until_next_boundary(datetime(2024, 1, 1, 12, 0), ()) is None
+
+    def test_picks_nearest_boundary(self):
+        now = datetime(2024, 1, 1, 5, 59, 30)
+        assert seconds_until_next_boundary(now, (360, 0)) == 30
+
+    def test_wraps_past_midnight(self):
+        now = datetime(2024, 1, 1, 23, 0)
+        assert seconds_until_next_boundary(now, (360,)) == 7 * 3600
+
+    def test_current_boundary_is_tomorrow(self):
+        now = datetime(2024, 1, 1, 6, 0)
+        assert seconds_until_next_boundary(now, (360,)) == 86400
+
+
+class FlakyHAClient:
+    """HA client whose first N turn_on calls fail."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.turn_on_calls = []
+
+    async def turn_on(self, entity_id):
+        self.turn_on_calls.append(entity_id)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("HA unavailable")
+
+    async def turn_off(self, entity_id):
+        pass
+
+
+def make_scheduler(ha_client, light_state, overrides=None):
+    """Scheduler over one tent whose light should be on for the next 11 hours."""
+    on_time = (datetime.now() - timedelta(hours=1)).strftime("%H:%M")
+    tent = SimpleNamespace(
+        config=SimpleNamespace(schedules={"light_cycle": {
+            "enabled": True, "mode": "veg", "on_time": on_time, "photoperiod_hours": 12,
+        }}),
+        light_slots={"light": "light.grow"},
+        actuators={"light": {"state": light_state}},
+    )
+    scheduler = LightScheduler(ha_client, SimpleNamespace(tents={"tent": tent}))
+    overrides = overrides or {}
+
+    async def active_overrides(tent_id, entity_ids):
+        return dict(overrides)
+
+    async def no_log(tent_id, notes):
+        pass
+
+    scheduler._active_override_entities = active_overrides
+    scheduler._log_event = no_log
+    return scheduler
+
+
+class TestSchedulerRetry:
+    """Test that unresolved lights are retried before the next boundary."""
+
+    def test_failed_switch_is_retried_before_next_boundary(self):
+        ha_client = FlakyHAClient(failures=1)
+        scheduler = make_scheduler(ha_client, "off")
+
+        asyncio.run(scheduler.tick())
+        assert ha_client.turn_on_calls == ["light.grow"]
+        assert scheduler._next_delay() <= RETRY_INTERVAL_SECONDS
+
+        asyncio.run(scheduler.tick())
+        assert ha_client.turn_on_calls == ["light.grow", "light.grow"]
+        assert scheduler._next_delay() == RESYNC_INTERVAL_SECONDS
+
+    def test_unknown_state_is_rechecked_soon(self):
+        ha_client = FlakyHAClient()
+        scheduler = make_scheduler(ha_client, None)
+
+        asyncio.run(scheduler.tick())
+        assert ha_client.turn_on_calls == []
+        assert scheduler._next_delay() <= RETRY_INTERVAL_SECONDS
+
+    def test_in_sync_light_sleeps_until_boundary(self):
+        ha_client = FlakyHAClient()
+        scheduler = make_scheduler(ha_client, "on")
+
+        asyncio.run(scheduler.tick())
+        assert ha_client.turn_on_calls == []
+        assert scheduler._next_delay() == RESYNC_INTERVAL_SECONDS
+
+    def test_override_expiry_caps_sleep(self):
+        ha_client = FlakyHAClient()
+        expires = datetime.now(timezone.utc) + timedelta(seconds=90)
+        scheduler = make_scheduler(ha_client, "off", {"light.grow": expires})
+
+        asyncio.run(scheduler.tick())
+        assert ha_client.turn_on_calls == []  # overridden, left alone
+        assert 85 <= scheduler._next_delay() <= 91
@@ -32,4 +32,9 @@ nginx &
 exec python3 -m uvicorn main:app \
     --host 127.0.0.1 \
     --port 8100 \
+    --loop auto \
+    --ws-per-message-deflate false \
+    --ws-ping-interval 15 \
+    --ws-ping-timeout 10 \
+    --no-access-log \
     --log-level "${LOG_LEVEL}"